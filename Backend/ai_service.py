@@ -3,16 +3,37 @@ AI Service for generating financial insights using OpenAI.
 """
 import os
 import json
-from openai import OpenAI
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
+from http_client import get_http_client
+
 load_dotenv()
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Async OpenAI client over the shared keep-alive pool (http_client); created lazily
+# on the running event loop and dropped by the app lifespan (see close_client)
+client = None
+
+
+def get_client() -> AsyncOpenAI:
+    """Return the shared async OpenAI client, creating it on first use."""
+    global client
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            timeout=30,
+            http_client=get_http_client()
+        )
+    return client
+
+
+async def close_client() -> None:
+    """Drop the OpenAI client (its connection pool is closed with the shared http_client)."""
+    global client
+    client = None
 
 
-def generate_financial_insights(analysis_data: dict) -> dict:
+async def generate_financial_insights(analysis_data: dict) -> dict:
     """
     Generate comprehensive AI-powered financial insights.
     """
@@ -20,7 +41,7 @@ def generate_financial_insights(analysis_data: dict) -> dict:
     prompt = build_analysis_prompt(analysis_data)
     
     try:
-        response = client.chat.completions.create(
+        response = await get_client().chat.completions.create(
             model="gpt-4o",
             messages=[
                 {
@@ -21,8 +21,16 @@ import os
 import sys
 sys.path.append(os.getcwd())
 from models import Base
+import calculator_models  # noqa: F401  (registers calculator tables on the shared Base)
 target_metadata = Base.metadata
 
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Skip Postgres-only indexes (e.g. GIN over JSONB) when autogenerating against other databases."""
+    if type_ == "index" and not reflected and obj.dialect_options["postgresql"].get("using"):
+        return context.get_context().dialect.name == "postgresql"
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -45,6 +53,8 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        render_as_batch=True,  # SQLite can only ALTER columns via table rebuilds
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -68,7 +78,10 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=True,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
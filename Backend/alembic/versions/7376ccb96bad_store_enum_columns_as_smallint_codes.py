@@ -0,0 +1,54 @@
+"""Store enum columns as smallint codes
+
+Revision ID: 7376ccb96bad
+Revises: 21b8ae0ccbca
+Create Date: 2026-10-15 23:02:17.956330
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7376ccb96bad'
+down_revision: Union[str, Sequence[str], None] = '21b8ae0ccbca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, enum type name, member names in declaration order = smallint code)
+ENUM_COLUMNS = [
+    ('family_members', 'relation_type', 'relationshiptype', ['PRIMARY', 'SPOUSE', 'CHILD', 'FATHER', 'MOTHER']),
+    ('goals', 'target_type', 'targettype', ['AGE', 'DATE']),
+    ('bank_accounts', 'account_type', 'accounttype', ['SAVINGS', 'CURRENT', 'FD', 'RD']),
+    ('investment_assets', 'type', 'investmenttype', ['MF', 'STOCK', 'FD', 'RD', 'CHIT', 'OTHER']),
+    ('insurance_policies', 'policy_type', 'policytype', ['TERM', 'ENDOWMENT', 'ULIP', 'WHOLE_LIFE', 'HEALTH', 'OTHER']),
+    ('liabilities', 'type', 'liabilitytype', ['HOME', 'CAR', 'PERSONAL', 'OTHER']),
+]
+
+
+def _convert(table, column, new_type, mapping) -> None:
+    """Rewrite column through a temporary column of new_type using a CASE over mapping."""
+    tmp = f'{column}_tmp'
+    cases = ' '.join(f"WHEN {old!r} THEN {new!r}" for old, new in mapping)
+    with op.batch_alter_table(table, schema=None) as batch_op:
+        batch_op.add_column(sa.Column(tmp, new_type, nullable=True))
+    op.execute(f'UPDATE {table} SET {tmp} = CASE CAST({column} AS VARCHAR) {cases} END')
+    with op.batch_alter_table(table, schema=None) as batch_op:
+        batch_op.drop_column(column)
+        batch_op.alter_column(tmp, new_column_name=column)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column, _, names in ENUM_COLUMNS:
+        _convert(table, column, sa.SmallInteger(), [(name, code) for code, name in enumerate(names)])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column, type_name, names in ENUM_COLUMNS:
+        _convert(table, column, sa.Enum(*names, name=type_name),
+                 [(str(code), name) for code, name in enumerate(names)])
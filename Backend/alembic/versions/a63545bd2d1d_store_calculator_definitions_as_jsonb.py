@@ -0,0 +1,51 @@
+"""Store calculator definitions as JSONB
+
+Revision ID: a63545bd2d1d
+Revises: 8dd201162ca0
+Create Date: 2026-10-15 23:22:08.037760
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a63545bd2d1d'
+down_revision: Union[str, Sequence[str], None] = '8dd201162ca0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # JSONB and GIN indexes are Postgres features; other databases keep plain JSON
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    op.alter_column(
+        'calculator_versions', 'definition_json',
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        existing_type=sa.JSON(),
+        existing_nullable=False,
+        postgresql_using='definition_json::jsonb'
+    )
+    op.create_index(
+        'ix_calculator_versions_definition_gin', 'calculator_versions', ['definition_json'],
+        unique=False, postgresql_using='gin', postgresql_ops={'definition_json': 'jsonb_path_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_calculator_versions_definition_gin', table_name='calculator_versions')
+    op.alter_column(
+        'calculator_versions', 'definition_json',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        existing_nullable=False,
+        postgresql_using='definition_json::json'
+    )
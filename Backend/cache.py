@@ -0,0 +1,131 @@
+"""
+Response Cache for AI Financial Planner
+Redis-backed cache for expensive, deterministic results (e.g. stored-user analysis),
+plus an in-process TTL tier in front of it for hot, slowly changing reads.
+Redis is skipped entirely when it is not configured or unreachable.
+"""
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import orjson
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis is optional; without it every lookup is a miss
+    aioredis = None
+
+REDIS_URL = os.getenv("REDIS_URL")
+ANALYSIS_CACHE_TTL = 3600  # seconds
+CALCULATOR_CACHE_TTL = 300  # seconds (Redis tier)
+LOCAL_CACHE_TTL = 60  # seconds; bounds staleness across worker processes
+LOCAL_CACHE_SIZE = 1024
+
+logger = logging.getLogger(__name__)
+
+_redis = aioredis.from_url(REDIS_URL) if aioredis is not None and REDIS_URL else None
+
+
+def analysis_cache_key(user_id: str, updated_at) -> str:
+    """Cache key for a user's analysis; changes whenever the user's data changes."""
+    stamp = updated_at.timestamp() if updated_at else 0
+    return f"analysis:{user_id}:{stamp}"
+
+
+async def get_cached(key: str) -> Optional[Any]:
+    """Return the cached JSON value for key, or None on miss/unavailable cache."""
+    if _redis is None:
+        return None
+    try:
+        cached = await _redis.get(key)
+    except Exception:
+        logger.warning("Cache read failed for %s", key, exc_info=True)
+        return None
+    return orjson.loads(cached) if cached else None
+
+
+async def set_cached(key: str, value: Any, ttl: int = ANALYSIS_CACHE_TTL) -> None:
+    """Store value as JSON under key with a TTL (best-effort)."""
+    if _redis is None:
+        return
+    try:
+        await _redis.setex(key, ttl, orjson.dumps(value))
+    except Exception:
+        logger.warning("Cache write failed for %s", key, exc_info=True)
+
+
+async def delete_cached(*keys: str) -> None:
+    """Remove keys from Redis (best-effort)."""
+    if _redis is None or not keys:
+        return
+    try:
+        await _redis.delete(*keys)
+    except Exception:
+        logger.warning("Cache delete failed for %s", ", ".join(keys), exc_info=True)
+
+
+async def delete_cached_prefix(prefix: str) -> None:
+    """Remove every Redis key starting with prefix (best-effort)."""
+    if _redis is None:
+        return
+    try:
+        keys = [key async for key in _redis.scan_iter(match=f"{prefix}*")]
+        if keys:
+            await _redis.delete(*keys)
+    except Exception:
+        logger.warning("Cache delete failed for prefix %s", prefix, exc_info=True)
+
+
+# ============================================================================
+# TWO-TIER CACHE (in-process TTL/LRU in front of Redis)
+# ============================================================================
+
+_local: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+
+def _local_get(key: str) -> Optional[Any]:
+    entry = _local.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        del _local[key]
+        return None
+    _local.move_to_end(key)
+    return value
+
+
+def _local_set(key: str, value: Any) -> None:
+    _local[key] = (time.monotonic() + LOCAL_CACHE_TTL, value)
+    _local.move_to_end(key)
+    if len(_local) > LOCAL_CACHE_SIZE:
+        _local.popitem(last=False)
+
+
+async def get_tiered(key: str) -> Optional[Any]:
+    """Look key up in process memory, then Redis; Redis hits are promoted to memory."""
+    value = _local_get(key)
+    if value is None:
+        value = await get_cached(key)
+        if value is not None:
+            _local_set(key, value)
+    return value
+
+
+async def set_tiered(key: str, value: Any, ttl: int = CALCULATOR_CACHE_TTL) -> None:
+    """Store value in both tiers."""
+    _local_set(key, value)
+    await set_cached(key, value, ttl)
+
+
+async def invalidate(*keys: str, prefix: Optional[str] = None) -> None:
+    """Drop keys (and optionally everything under prefix) from both tiers."""
+    for key in keys:
+        _local.pop(key, None)
+    if prefix:
+        for key in [k for k in _local if k.startswith(prefix)]:
+            del _local[key]
+        await delete_cached_prefix(prefix)
+    await delete_cached(*keys)
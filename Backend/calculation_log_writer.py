@@ -0,0 +1,114 @@
+"""
+Calculation Log Writer
+Buffers calculator audit-log rows and bulk-inserts them off the request path.
+Rows are flushed every LOG_BATCH_SIZE rows or LOG_FLUSH_INTERVAL seconds, whichever comes first.
+A batch that fails to insert is retried once, then logged (with traceback) and dropped.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from database import AsyncSessionLocal
+from calculator_models import CalculationLog, CalculationLogTrace, generate_uuid
+
+LOG_BATCH_SIZE = 50
+LOG_FLUSH_INTERVAL = 0.2  # seconds
+LOG_RETRY_DELAY = 1.0  # seconds before the single retry of a failed batch
+
+logger = logging.getLogger(__name__)
+
+_queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+_flusher: Optional[asyncio.Task] = None
+
+
+def enqueue_calculation_log(
+    calculator_id: str,
+    version_id: str,
+    inputs: Dict[str, Any],
+    outputs: Dict[str, Any],
+    trace: List[Dict[str, Any]],
+    execution_time_ms: float = None,
+    user_id: str = None
+) -> None:
+    """Queue an execution for the audit log (same fields as calculator_crud.log_calculation)."""
+    _queue.put_nowait({
+        "id": generate_uuid(),
+        "calculator_id": calculator_id,
+        "version_id": version_id,
+        "inputs_json": inputs,
+        "outputs_json": outputs,
+        "trace_json": trace,
+        "execution_time_ms": execution_time_ms,
+        "user_id": user_id,
+        "created_at": datetime.utcnow()
+    })
+
+
+async def _write_batch(batch: List[Dict[str, Any]]) -> None:
+    traces = [{"log_id": row["id"], "trace_json": row["trace_json"]} for row in batch]
+    logs = [{k: v for k, v in row.items() if k != "trace_json"} for row in batch]
+    for attempt in range(2):
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(CalculationLog), logs)
+                await db.execute(insert(CalculationLogTrace), traces)
+                await db.commit()
+            return
+        except Exception:
+            if attempt == 0:
+                logger.warning("Calculation log flush failed (%d rows); retrying", len(batch), exc_info=True)
+            else:
+                logger.exception("Calculation log flush failed again; dropped %d audit rows", len(batch))
+                return
+        await asyncio.sleep(LOG_RETRY_DELAY)
+
+
+async def _flush_loop() -> None:
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        row = await _queue.get()
+        if row is None:
+            break
+        batch = [row]
+        deadline = loop.time() + LOG_FLUSH_INTERVAL
+        while len(batch) < LOG_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                row = await asyncio.wait_for(_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if row is None:
+                stopping = True
+                break
+            batch.append(row)
+        await _write_batch(batch)
+
+
+def start() -> None:
+    """Start the background flusher (app startup)."""
+    global _flusher
+    if _flusher is None:
+        _flusher = asyncio.create_task(_flush_loop())
+
+
+async def stop() -> None:
+    """Flush everything queued so far and stop the flusher (app shutdown)."""
+    global _flusher
+    if _flusher is not None:
+        _queue.put_nowait(None)
+        await _flusher
+        _flusher = None
+    # Rows queued after the sentinel (or with no flusher running)
+    remaining = []
+    while not _queue.empty():
+        row = _queue.get_nowait()
+        if row is not None:
+            remaining.append(row)
+    if remaining:
+        await _write_batch(remaining)
@@ -2,12 +2,15 @@
 CRUD Operations for Calculator Platform.
 Database operations for calculators, versions, logs, and conversations.
 """
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from sqlalchemy import select, func
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
+from typing import List, Optional, Dict, Any, Set
 from datetime import datetime
 
 from calculator_models import (
-    Calculator, CalculatorVersion, CalculationLog, CalculatorConversation
+    Calculator, CalculatorVersion, CalculationLog, CalculationLogTrace, CalculatorConversation
 )
 from calculator_schemas import CalculatorDefinition, CalculatorStatus
 
@@ -16,8 +19,8 @@ from calculator_schemas import CalculatorDefinition, CalculatorStatus
 # CALCULATOR CRUD
 # ============================================================================
 
-def create_calculator(
-    db: Session,
+async def create_calculator(
+    db: AsyncSession,
     name: str,
     category: str,
     description: str = None
@@ -30,59 +33,100 @@ def create_calculator(
         is_active=False
     )
     db.add(calculator)
-    db.commit()
-    db.refresh(calculator)
+    await db.commit()
+    await db.refresh(calculator)
     return calculator
 
 
-def get_calculator(db: Session, calculator_id: str) -> Optional[Calculator]:
+async def get_calculator(db: AsyncSession, calculator_id: str) -> Optional[Calculator]:
     """Get a calculator by ID."""
-    return db.query(Calculator).filter(Calculator.id == calculator_id).first()
+    return (await db.execute(select(Calculator).where(Calculator.id == calculator_id))).scalar_one_or_none()
 
 
-def get_calculator_by_slug(db: Session, slug: str) -> Optional[Calculator]:
+async def get_calculator_by_slug(db: AsyncSession, slug: str) -> Optional[Calculator]:
     """Get a calculator by its slug/calculator_id from definition."""
     # First check if it matches the database ID
-    calc = db.query(Calculator).filter(Calculator.id == slug).first()
+    calc = await get_calculator(db, slug)
     if calc:
         return calc
     
     # Otherwise search through versions for matching calculator_id in definition
-    versions = db.query(CalculatorVersion).filter(
-        CalculatorVersion.status == CalculatorStatus.APPROVED.value
-    ).all()
+    versions = (await db.execute(
+        select(CalculatorVersion).where(CalculatorVersion.status == CalculatorStatus.APPROVED.value)
+    )).scalars().all()
     
     for version in versions:
         if version.definition_json.get('calculator_id') == slug:
-            return version.calculator
+            return await get_calculator(db, version.calculator_id)
     
     return None
 
 
-def get_all_calculators(
-    db: Session,
+async def get_all_calculators(
+    db: AsyncSession,
     category: str = None,
     is_active: bool = None
 ) -> List[Calculator]:
     """Get all calculators with optional filters."""
-    query = db.query(Calculator)
+    query = select(Calculator)
     
     if category:
-        query = query.filter(Calculator.category == category)
+        query = query.where(Calculator.category == category)
     
     if is_active is not None:
-        query = query.filter(Calculator.is_active == is_active)
+        query = query.where(Calculator.is_active == is_active)
     
-    return query.order_by(Calculator.created_at.desc()).all()
+    return (await db.execute(query.order_by(Calculator.created_at.desc()))).scalars().all()
 
 
-def update_calculator(
-    db: Session,
+async def get_existing_calculator_names(db: AsyncSession, names: List[str]) -> Set[str]:
+    """Return which of the given calculator names already exist (one IN query)."""
+    result = await db.execute(select(Calculator.name).where(Calculator.name.in_(names)))
+    return set(result.scalars().all())
+
+
+async def get_all_with_active_version(
+    db: AsyncSession,
+    category: str = None,
+    is_active: bool = None
+) -> List[Row]:
+    """Get listing rows (calculator columns + active `version` number) in one query; see get_active_version."""
+    latest_approved = (
+        select(CalculatorVersion.id)
+        .where(
+            CalculatorVersion.calculator_id == Calculator.id,
+            CalculatorVersion.status == CalculatorStatus.APPROVED.value
+        )
+        .order_by(CalculatorVersion.created_at.desc())
+        .limit(1)
+        .correlate(Calculator)
+        .scalar_subquery()
+    )
+    active_version_id = func.coalesce(Calculator.current_version, latest_approved)
+    # Plain column rows: the listing needs no ORM identity tracking
+    query = select(
+        Calculator.id, Calculator.name, Calculator.category, Calculator.description,
+        Calculator.is_active, Calculator.created_at, CalculatorVersion.version
+    ).outerjoin(
+        CalculatorVersion, CalculatorVersion.id == active_version_id
+    )
+    
+    if category:
+        query = query.where(Calculator.category == category)
+    
+    if is_active is not None:
+        query = query.where(Calculator.is_active == is_active)
+    
+    return (await db.execute(query.order_by(Calculator.created_at.desc()))).all()
+
+
+async def update_calculator(
+    db: AsyncSession,
     calculator_id: str,
     updates: Dict[str, Any]
 ) -> Optional[Calculator]:
     """Update a calculator."""
-    calculator = get_calculator(db, calculator_id)
+    calculator = await get_calculator(db, calculator_id)
     if not calculator:
         return None
     
@@ -91,45 +135,45 @@ def update_calculator(
             setattr(calculator, key, value)
     
     calculator.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(calculator)
+    await db.commit()
+    await db.refresh(calculator)
     return calculator
 
 
-def delete_calculator(db: Session, calculator_id: str) -> bool:
+async def delete_calculator(db: AsyncSession, calculator_id: str) -> bool:
     """Delete a calculator and all related data."""
-    calculator = get_calculator(db, calculator_id)
+    calculator = await get_calculator(db, calculator_id)
     if not calculator:
         return False
     
-    db.delete(calculator)
-    db.commit()
+    await db.delete(calculator)
+    await db.commit()
     return True
 
 
-def activate_calculator(db: Session, calculator_id: str) -> Optional[Calculator]:
+async def activate_calculator(db: AsyncSession, calculator_id: str) -> Optional[Calculator]:
     """Activate a calculator for public use."""
-    return update_calculator(db, calculator_id, {"is_active": True})
+    return await update_calculator(db, calculator_id, {"is_active": True})
 
 
-def deactivate_calculator(db: Session, calculator_id: str) -> Optional[Calculator]:
+async def deactivate_calculator(db: AsyncSession, calculator_id: str) -> Optional[Calculator]:
     """Deactivate a calculator."""
-    return update_calculator(db, calculator_id, {"is_active": False})
+    return await update_calculator(db, calculator_id, {"is_active": False})
 
 
 # ============================================================================
 # VERSION CRUD
 # ============================================================================
 
-def create_calculator_version(
-    db: Session,
+async def create_calculator_version(
+    db: AsyncSession,
     calculator_id: str,
     definition: CalculatorDefinition,
     created_by: str = None
 ) -> CalculatorVersion:
     """Create a new version of a calculator."""
     # Get existing versions to determine version number
-    existing_versions = get_calculator_versions(db, calculator_id)
+    existing_versions = await get_calculator_versions(db, calculator_id)
     
     if existing_versions:
         # Parse latest version and increment
@@ -143,51 +187,58 @@ def create_calculator_version(
     version = CalculatorVersion(
         calculator_id=calculator_id,
         version=new_version,
-        definition_json=definition.dict(),
+        definition_json=definition.model_dump(),
         status="draft",
         created_by=created_by
     )
     db.add(version)
-    db.commit()
-    db.refresh(version)
+    await db.commit()
+    await db.refresh(version)
     return version
 
 
-def get_calculator_version(db: Session, version_id: str) -> Optional[CalculatorVersion]:
+async def get_calculator_version(db: AsyncSession, version_id: str) -> Optional[CalculatorVersion]:
     """Get a specific version by ID."""
-    return db.query(CalculatorVersion).filter(CalculatorVersion.id == version_id).first()
+    return (await db.execute(select(CalculatorVersion).where(CalculatorVersion.id == version_id))).scalar_one_or_none()
 
 
-def get_calculator_versions(
-    db: Session,
+async def get_calculator_versions(
+    db: AsyncSession,
     calculator_id: str
 ) -> List[CalculatorVersion]:
-    """Get all versions of a calculator, newest first."""
-    return db.query(CalculatorVersion).filter(
-        CalculatorVersion.calculator_id == calculator_id
-    ).order_by(CalculatorVersion.created_at.desc()).all()
+    """Get all versions of a calculator, newest first (definition_json is not loaded)."""
+    return (await db.execute(
+        select(CalculatorVersion)
+        .options(defer(CalculatorVersion.definition_json, raiseload=True))
+        .where(CalculatorVersion.calculator_id == calculator_id)
+        .order_by(CalculatorVersion.created_at.desc())
+    )).scalars().all()
 
 
-def get_active_version(db: Session, calculator_id: str) -> Optional[CalculatorVersion]:
+async def get_active_version(db: AsyncSession, calculator_id: str) -> Optional[CalculatorVersion]:
     """Get the active (approved) version of a calculator."""
-    calculator = get_calculator(db, calculator_id)
+    calculator = await get_calculator(db, calculator_id)
     if not calculator or not calculator.current_version:
         # Return latest approved version
-        return db.query(CalculatorVersion).filter(
-            CalculatorVersion.calculator_id == calculator_id,
-            CalculatorVersion.status == CalculatorStatus.APPROVED.value
-        ).order_by(CalculatorVersion.created_at.desc()).first()
+        return (await db.execute(
+            select(CalculatorVersion)
+            .where(
+                CalculatorVersion.calculator_id == calculator_id,
+                CalculatorVersion.status == CalculatorStatus.APPROVED.value
+            )
+            .order_by(CalculatorVersion.created_at.desc())
+        )).scalars().first()
     
-    return get_calculator_version(db, calculator.current_version)
+    return await get_calculator_version(db, calculator.current_version)
 
 
-def approve_version(
-    db: Session,
+async def approve_version(
+    db: AsyncSession,
     version_id: str,
     approved_by: str = None
 ) -> Optional[CalculatorVersion]:
     """Approve a calculator version and set it as active."""
-    version = get_calculator_version(db, version_id)
+    version = await get_calculator_version(db, version_id)
     if not version:
         return None
     
@@ -197,25 +248,25 @@ def approve_version(
     version.approved_at = datetime.utcnow()
     
     # Set as current version and activate calculator
-    calculator = version.calculator
+    calculator = await get_calculator(db, version.calculator_id)
     calculator.current_version = version_id
     calculator.is_active = True
     calculator.updated_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(version)
+    await db.commit()
+    await db.refresh(version)
     return version
 
 
-def deprecate_version(db: Session, version_id: str) -> Optional[CalculatorVersion]:
+async def deprecate_version(db: AsyncSession, version_id: str) -> Optional[CalculatorVersion]:
     """Deprecate a calculator version."""
-    version = get_calculator_version(db, version_id)
+    version = await get_calculator_version(db, version_id)
     if not version:
         return None
     
     version.status = CalculatorStatus.DEPRECATED.value
-    db.commit()
-    db.refresh(version)
+    await db.commit()
+    await db.refresh(version)
     return version
 
 
@@ -223,8 +274,8 @@ def deprecate_version(db: Session, version_id: str) -> Optional[CalculatorVersio
 # CALCULATION LOG CRUD
 # ============================================================================
 
-def log_calculation(
-    db: Session,
+async def log_calculation(
+    db: AsyncSession,
     calculator_id: str,
     version_id: str,
     inputs: Dict[str, Any],
@@ -239,40 +290,40 @@ def log_calculation(
         version_id=version_id,
         inputs_json=inputs,
         outputs_json=outputs,
-        trace_json=trace,
+        trace=CalculationLogTrace(trace_json=trace),
         execution_time_ms=execution_time_ms,
         user_id=user_id
     )
     db.add(log)
-    db.commit()
-    db.refresh(log)
+    await db.commit()
+    await db.refresh(log)
     return log
 
 
-def get_calculation_logs(
-    db: Session,
+async def get_calculation_logs(
+    db: AsyncSession,
     calculator_id: str = None,
     user_id: str = None,
     limit: int = 100
 ) -> List[CalculationLog]:
-    """Get calculation logs with optional filters."""
-    query = db.query(CalculationLog)
+    """Get calculation logs with optional filters (traces are not loaded)."""
+    query = select(CalculationLog)
     
     if calculator_id:
-        query = query.filter(CalculationLog.calculator_id == calculator_id)
+        query = query.where(CalculationLog.calculator_id == calculator_id)
     
     if user_id:
-        query = query.filter(CalculationLog.user_id == user_id)
+        query = query.where(CalculationLog.user_id == user_id)
     
-    return query.order_by(CalculationLog.created_at.desc()).limit(limit).all()
+    return (await db.execute(query.order_by(CalculationLog.created_at.desc()).limit(limit))).scalars().all()
 
 
 # ============================================================================
 # CONVERSATION CRUD
 # ============================================================================
 
-def create_conversation(
-    db: Session,
+async def create_conversation(
+    db: AsyncSession,
     initial_description: str,
     created_by: str = None
 ) -> CalculatorConversation:
@@ -284,25 +335,25 @@ def create_conversation(
         created_by=created_by
     )
     db.add(conversation)
-    db.commit()
-    db.refresh(conversation)
+    await db.commit()
+    await db.refresh(conversation)
     return conversation
 
 
-def get_conversation(db: Session, conversation_id: str) -> Optional[CalculatorConversation]:
+async def get_conversation(db: AsyncSession, conversation_id: str) -> Optional[CalculatorConversation]:
     """Get a conversation by ID."""
-    return db.query(CalculatorConversation).filter(
-        CalculatorConversation.id == conversation_id
-    ).first()
+    return (await db.execute(
+        select(CalculatorConversation).where(CalculatorConversation.id == conversation_id)
+    )).scalar_one_or_none()
 
 
-def update_conversation(
-    db: Session,
+async def update_conversation(
+    db: AsyncSession,
     conversation_id: str,
     updates: Dict[str, Any]
 ) -> Optional[CalculatorConversation]:
     """Update a conversation."""
-    conversation = get_conversation(db, conversation_id)
+    conversation = await get_conversation(db, conversation_id)
     if not conversation:
         return None
     
@@ -311,19 +362,19 @@ def update_conversation(
             setattr(conversation, key, value)
     
     conversation.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(conversation)
+    await db.commit()
+    await db.refresh(conversation)
     return conversation
 
 
-def add_conversation_message(
-    db: Session,
+async def add_conversation_message(
+    db: AsyncSession,
     conversation_id: str,
     role: str,
     content: str
 ) -> Optional[CalculatorConversation]:
     """Add a message to a conversation."""
-    conversation = get_conversation(db, conversation_id)
+    conversation = await get_conversation(db, conversation_id)
     if not conversation:
         return None
     
@@ -336,18 +387,18 @@ def add_conversation_message(
     
     conversation.messages_json = messages
     conversation.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(conversation)
+    await db.commit()
+    await db.refresh(conversation)
     return conversation
 
 
-def complete_conversation(
-    db: Session,
+async def complete_conversation(
+    db: AsyncSession,
     conversation_id: str,
     calculator_id: str
 ) -> Optional[CalculatorConversation]:
     """Mark conversation as completed with created calculator."""
-    return update_conversation(db, conversation_id, {
+    return await update_conversation(db, conversation_id, {
         "state": "completed",
         "final_calculator_id": calculator_id
     })
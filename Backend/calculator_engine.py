@@ -8,7 +8,11 @@ import operator
 import math
 from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime
+from functools import cached_property, lru_cache, reduce
 import time
+from collections import OrderedDict
+
+import numpy as np
 
 from calculator_schemas import (
     CalculatorDefinition, 
@@ -22,6 +26,10 @@ from calculator_schemas import (
 # SAFE EXPRESSION EVALUATOR
 # ============================================================================
 
+def _invalid_expression(expression: str, error: Exception) -> ValueError:
+    return ValueError(f"Invalid expression '{expression}': {str(error)}")
+
+
 class SafeExpressionEvaluator:
     """
     Safe mathematical expression evaluator using AST parsing.
@@ -69,97 +77,144 @@ class SafeExpressionEvaluator:
         'tan': math.tan,
     }
     
+    # Element-wise counterparts of FUNCTIONS, for expressions over NumPy arrays
+    ARRAY_FUNCTIONS = {
+        'abs': np.abs,
+        'round': np.round,
+        'min': lambda *args: reduce(np.minimum, args),
+        'max': lambda *args: reduce(np.maximum, args),
+        'pow': np.power,
+        'sqrt': np.sqrt,
+        'log': lambda x, base=None: np.log(x) if base is None else np.log(x) / np.log(base),
+        'log10': np.log10,
+        'exp': np.exp,
+        'floor': np.floor,
+        'ceil': np.ceil,
+        'sin': np.sin,
+        'cos': np.cos,
+        'tan': np.tan,
+    }
+    
     def __init__(self, context: Dict[str, Any] = None):
         self.context = context or {}
     
     def evaluate(self, expression: str) -> Any:
         """Safely evaluate a mathematical expression."""
         try:
-            tree = ast.parse(expression, mode='eval')
-            return self._eval_node(tree.body)
+            return self.compile(expression)(self.context)
         except Exception as e:
-            raise ValueError(f"Invalid expression '{expression}': {str(e)}")
+            raise _invalid_expression(expression, e)
     
-    def _eval_node(self, node: ast.AST) -> Any:
-        """Recursively evaluate AST nodes."""
-        if isinstance(node, ast.Constant):  # Python 3.8+
-            return node.value
-        
-        elif isinstance(node, ast.Num):  # Python 3.7 compatibility
-            return node.n
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def compile(expression: str, vectorised: bool = False) -> Callable[[Dict[str, Any]], Any]:
+        """
+        Parse and whitelist-check an expression once; returns a function of the context.
+        Cached per expression string, so repeated executions only walk the closures.
+        With vectorised=True the context holds NumPy arrays and conditionals apply element-wise.
+        """
+        tree = ast.parse(expression, mode='eval')
+        return SafeExpressionEvaluator._compile_node(tree.body, vectorised)
+    
+    @classmethod
+    def _compile_node(cls, node: ast.AST, vectorised: bool = False) -> Callable[[Dict[str, Any]], Any]:
+        """Recursively turn AST nodes into closures over the evaluation context."""
+        compile_node = lambda child: cls._compile_node(child, vectorised)
         
-        elif isinstance(node, ast.Str):  # Python 3.7 compatibility
-            return node.s
+        if isinstance(node, ast.Constant):
+            value = node.value
+            return lambda ctx: value
         
         elif isinstance(node, ast.Name):
-            # Variable lookup
+            # Variable lookup; context entries shadow the built-in functions
             name = node.id
-            if name in self.context:
-                return self.context[name]
-            elif name in self.FUNCTIONS:
-                return self.FUNCTIONS[name]
-            elif name == 'True':
-                return True
-            elif name == 'False':
-                return False
-            else:
+            functions = cls.ARRAY_FUNCTIONS if vectorised else cls.FUNCTIONS
+            if name in functions:
+                func = functions[name]
+                return lambda ctx: ctx[name] if name in ctx else func
+            
+            def lookup(ctx):
+                if name in ctx:
+                    return ctx[name]
                 raise ValueError(f"Unknown variable: {name}")
+            return lookup
         
         elif isinstance(node, ast.BinOp):
-            left = self._eval_node(node.left)
-            right = self._eval_node(node.right)
-            op = self.OPERATORS.get(type(node.op))
+            left = compile_node(node.left)
+            right = compile_node(node.right)
+            op = cls.OPERATORS.get(type(node.op))
             if op is None:
                 raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
-            return op(left, right)
+            return lambda ctx: op(left(ctx), right(ctx))
         
         elif isinstance(node, ast.UnaryOp):
-            operand = self._eval_node(node.operand)
-            op = self.OPERATORS.get(type(node.op))
+            operand = compile_node(node.operand)
+            op = cls.OPERATORS.get(type(node.op))
             if op is None:
                 raise ValueError(f"Unsupported unary operator: {type(node.op).__name__}")
-            return op(operand)
+            return lambda ctx: op(operand(ctx))
         
         elif isinstance(node, ast.Compare):
             # Handle comparison chains like a < b < c
-            left = self._eval_node(node.left)
+            first = compile_node(node.left)
+            links = []
             for op, comparator in zip(node.ops, node.comparators):
-                right = self._eval_node(comparator)
-                cmp_func = self.COMPARISONS.get(type(op))
+                cmp_func = cls.COMPARISONS.get(type(op))
                 if cmp_func is None:
                     raise ValueError(f"Unsupported comparison: {type(op).__name__}")
-                if not cmp_func(left, right):
-                    return False
-                left = right
-            return True
+                links.append((cmp_func, compile_node(comparator)))
+            
+            if vectorised:
+                def compare(ctx):
+                    left = first(ctx)
+                    result = True
+                    for cmp_func, comparator in links:
+                        right = comparator(ctx)
+                        result = np.logical_and(result, cmp_func(left, right))
+                        left = right
+                    return result
+                return compare
+            
+            def compare(ctx):
+                left = first(ctx)
+                for cmp_func, comparator in links:
+                    right = comparator(ctx)
+                    if not cmp_func(left, right):
+                        return False
+                    left = right
+                return True
+            return compare
         
         elif isinstance(node, ast.Call):
-            func = self._eval_node(node.func)
-            args = [self._eval_node(arg) for arg in node.args]
-            if callable(func):
-                return func(*args)
-            raise ValueError(f"Not a callable: {func}")
+            func_node = compile_node(node.func)
+            arg_nodes = [compile_node(arg) for arg in node.args]
+            
+            def call(ctx):
+                func = func_node(ctx)
+                args = [arg(ctx) for arg in arg_nodes]
+                if callable(func):
+                    return func(*args)
+                raise ValueError(f"Not a callable: {func}")
+            return call
         
         elif isinstance(node, ast.IfExp):
             # Ternary: a if condition else b
-            condition = self._eval_node(node.test)
-            if condition:
-                return self._eval_node(node.body)
-            else:
-                return self._eval_node(node.orelse)
+            test = compile_node(node.test)
+            body = compile_node(node.body)
+            orelse = compile_node(node.orelse)
+            if vectorised:
+                return lambda ctx: np.where(test(ctx), body(ctx), orelse(ctx))
+            return lambda ctx: body(ctx) if test(ctx) else orelse(ctx)
         
         elif isinstance(node, ast.BoolOp):
             # and / or
+            values = [compile_node(value) for value in node.values]
+            if vectorised:
+                combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+                return lambda ctx: reduce(combine, [value(ctx) for value in values])
             if isinstance(node.op, ast.And):
-                for value in node.values:
-                    if not self._eval_node(value):
-                        return False
-                return True
-            elif isinstance(node.op, ast.Or):
-                for value in node.values:
-                    if self._eval_node(value):
-                        return True
-                return False
+                return lambda ctx: all(value(ctx) for value in values)
+            return lambda ctx: any(value(ctx) for value in values)
         
         else:
             raise ValueError(f"Unsupported expression type: {type(node).__name__}")
@@ -169,45 +224,56 @@ class SafeExpressionEvaluator:
 # PRE-BUILT RULE ENGINES
 # ============================================================================
 
+# Tax slabs as (lower edges, widths, rates); the last slab is open-ended
+def _slabs(edges, rates):
+    """Slab table as plain (lower, width, rate) rows for scalars plus NumPy columns for arrays."""
+    uppers = edges[1:] + [math.inf]
+    rows = tuple((float(lo), float(hi - lo), float(rate)) for lo, hi, rate in zip(edges, uppers, rates))
+    lower, width, rate = (np.array(column, dtype=np.float64) for column in zip(*rows))
+    return rows, lower, width, rate
+
+
+OLD_REGIME_SLABS = _slabs([0, 250000, 500000, 1000000], [0, 0.05, 0.20, 0.30])
+NEW_REGIME_SLABS = _slabs([0, 300000, 700000, 1000000, 1200000, 1500000], [0, 0.05, 0.10, 0.15, 0.20, 0.30])
+
+
+def _slab_tax(income, slabs, deduction=0.0):
+    """Tax on income less deduction (scalar or array): the part inside each slab times its rate."""
+    rows, lower, width, rates = slabs
+    if isinstance(income, (int, float)) or np.ndim(income) == 0:
+        # Single incomes stay in plain Python; NumPy's per-call overhead dwarfs a few slabs
+        income = float(income) - deduction
+        tax = 0.0
+        for slab_lower, slab_width, rate in rows:
+            if income <= slab_lower:
+                break
+            tax += min(income - slab_lower, slab_width) * rate
+        return tax
+    income = np.asarray(income, dtype=np.float64) - deduction
+    return (np.clip(income[..., None] - lower, 0, width) * rates).sum(axis=-1)
+
+
 class RuleEngines:
     """Collection of pre-built rule engines for complex calculations."""
     
     @staticmethod
-    def income_tax_slabs_india_old(taxable_income: float, **kwargs) -> float:
+    def income_tax_slabs_india_old(taxable_income, **kwargs):
         """
         Indian Income Tax - Old Regime (FY 2024-25)
         Standard deduction of 50,000 assumed already applied.
+        Accepts a single income or an array of incomes.
         """
-        if taxable_income <= 250000:
-            return 0
-        elif taxable_income <= 500000:
-            return (taxable_income - 250000) * 0.05
-        elif taxable_income <= 1000000:
-            return 12500 + (taxable_income - 500000) * 0.20
-        else:
-            return 12500 + 100000 + (taxable_income - 1000000) * 0.30
+        return _slab_tax(taxable_income, OLD_REGIME_SLABS)
     
     @staticmethod
-    def income_tax_slabs_india_new(taxable_income: float, **kwargs) -> float:
+    def income_tax_slabs_india_new(taxable_income, **kwargs):
         """
         Indian Income Tax - New Regime (FY 2024-25)
         With standard deduction of 75,000.
+        Accepts a single income or an array of incomes.
         """
-        # Apply standard deduction
-        taxable = max(0, taxable_income - 75000)
-        
-        if taxable <= 300000:
-            return 0
-        elif taxable <= 700000:
-            return (taxable - 300000) * 0.05
-        elif taxable <= 1000000:
-            return 20000 + (taxable - 700000) * 0.10
-        elif taxable <= 1200000:
-            return 20000 + 30000 + (taxable - 1000000) * 0.15
-        elif taxable <= 1500000:
-            return 20000 + 30000 + 30000 + (taxable - 1200000) * 0.20
-        else:
-            return 20000 + 30000 + 30000 + 60000 + (taxable - 1500000) * 0.30
+        # Apply standard deduction (negative taxable income falls in the 0% slab)
+        return _slab_tax(taxable_income, NEW_REGIME_SLABS, deduction=75000)
     
     @staticmethod
     def emi_calculator(principal: float, annual_rate: float, tenure_months: int, **kwargs) -> float:
@@ -219,7 +285,8 @@ class RuleEngines:
             return principal / tenure_months
         
         monthly_rate = annual_rate / 12 / 100
-        emi = principal * monthly_rate * pow(1 + monthly_rate, tenure_months) / (pow(1 + monthly_rate, tenure_months) - 1)
+        growth = pow(1 + monthly_rate, tenure_months)
+        emi = principal * monthly_rate * growth / (growth - 1)
         return round(emi, 2)
     
     @staticmethod
@@ -245,7 +312,12 @@ class RuleEngines:
         if years == 0 or initial_value == 0:
             return 0
         
-        cagr = (pow(final_value / initial_value, 1 / years) - 1) * 100
+        ratio = final_value / initial_value
+        if ratio > 0:
+            # expm1/log keep small growth rates accurate
+            cagr = math.expm1(math.log(ratio) / years) * 100
+        else:
+            cagr = (pow(ratio, 1 / years) - 1) * 100
         return round(cagr, 2)
     
     @staticmethod
@@ -260,6 +332,9 @@ class RuleEngines:
     
     # Registry of available rule engines
     REGISTRY: Dict[str, Callable] = {}
+    
+    # Rule engines that take NumPy arrays as-is (the rest branch on scalars)
+    ARRAY_ENGINES = frozenset({'income_tax_slabs_india_old', 'income_tax_slabs_india_new'})
 
 
 # Populate registry
@@ -287,6 +362,13 @@ class CalculatorEngine:
         self.definition = definition
         self.context: Dict[str, Any] = {}
         self.trace: List[StepTrace] = []
+        # Each step resolved once to a function of the context (see _compile_step)
+        self._runners = [self._compile_step(step) for step in definition.steps]
+    
+    @cached_property
+    def _batch_runners(self) -> List[Callable[[Dict[str, Any]], Any]]:
+        """Element-wise step runners, compiled on the first execute_batch call."""
+        return [self._compile_step(step, vectorised=True) for step in self.definition.steps]
     
     def validate_inputs(self, inputs: Dict[str, Any]) -> List[str]:
         """Validate inputs against calculator definition."""
@@ -326,7 +408,7 @@ class CalculatorEngine:
         Execute the calculator with given inputs.
         Returns full execution trace and results.
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         self.context = {}
         self.trace = []
         
@@ -353,8 +435,8 @@ class CalculatorEngine:
                     self.context[key] = value
             
             # Execute steps
-            for step in self.definition.steps:
-                step_trace = self._execute_step(step)
+            for step, run in zip(self.definition.steps, self._runners):
+                step_trace = self._execute_step(step, run)
                 self.trace.append(step_trace)
             
             # Collect outputs
@@ -363,7 +445,7 @@ class CalculatorEngine:
                 if output_key in self.context:
                     outputs[output_key] = self.context[output_key]
             
-            execution_time = (time.time() - start_time) * 1000
+            execution_time = (time.perf_counter_ns() - start_ns) / 1e6
             
             return CalculatorExecutionResult(
                 calculator_id=self.definition.calculator_id,
@@ -376,7 +458,7 @@ class CalculatorEngine:
             )
         
         except Exception as e:
-            execution_time = (time.time() - start_time) * 1000
+            execution_time = (time.perf_counter_ns() - start_ns) / 1e6
             return CalculatorExecutionResult(
                 calculator_id=self.definition.calculator_id,
                 calculator_name=self.definition.name,
@@ -387,26 +469,74 @@ class CalculatorEngine:
                 execution_time_ms=round(execution_time, 2)
             )
     
-    def _execute_step(self, step: CalculatorStep) -> StepTrace:
-        """Execute a single calculation step."""
-        input_values = dict(self.context)  # Snapshot of current context
-        result = None
+    def execute_batch(self, inputs: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """
+        Run the calculator over many scenarios at once (e.g. a rate x tenure grid).
+        Inputs map keys to arrays or scalars that broadcast together; returns output arrays.
+        No trace is recorded; invalid inputs or steps raise ValueError.
+        """
+        context: Dict[str, Any] = {}
+        for input_def in self.definition.inputs:
+            key = input_def.key
+            if input_def.required and inputs.get(key) is None:
+                raise ValueError(f"Missing required input: {input_def.label} ({key})")
+            value = inputs.get(key, input_def.default)
+            if value is not None:
+                context[key] = np.asarray(value, dtype=np.float64 if input_def.type == "number" else None)
+        
+        # Both branches of a conditional are computed for every scenario, so a guarded
+        # division (x / y if y > 0 else 0) may divide by zero in the branch that is discarded
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for step, run in zip(self.definition.steps, self._batch_runners):
+                context[step.id] = run(context)
+        
+        return {key: context[key] for key in self.definition.outputs if key in context}
+    
+    @staticmethod
+    def _compile_step(step: CalculatorStep, vectorised: bool = False) -> Callable[[Dict[str, Any]], Any]:
+        """
+        Resolve a step to a function of the context: a compiled expression or a rule engine.
+        Problems with the step are raised when it runs, so earlier steps still appear in the trace.
+        With vectorised=True the context holds arrays: expressions compile element-wise and
+        rule engines outside RuleEngines.ARRAY_ENGINES are applied per scenario.
+        """
+        def fail(error: Exception):
+            def run(context):
+                raise error
+            return run
         
         if step.expression:
-            # Use safe expression evaluator
-            evaluator = SafeExpressionEvaluator(self.context)
-            result = evaluator.evaluate(step.expression)
+            # Use safe expression evaluator (compiled once per expression string)
+            expression = step.expression
+            try:
+                compiled = SafeExpressionEvaluator.compile(expression, vectorised)
+            except Exception as e:
+                return fail(_invalid_expression(expression, e))
+            
+            def run(context):
+                try:
+                    return compiled(context)
+                except Exception as e:
+                    raise _invalid_expression(expression, e)
+            return run
         
         elif step.rule_engine:
             # Use pre-built rule engine
             if step.rule_engine not in RuleEngines.REGISTRY:
-                raise ValueError(f"Unknown rule engine: {step.rule_engine}")
+                return fail(ValueError(f"Unknown rule engine: {step.rule_engine}"))
             
             rule_func = RuleEngines.REGISTRY[step.rule_engine]
-            result = rule_func(**self.context)
+            if vectorised and step.rule_engine not in RuleEngines.ARRAY_ENGINES:
+                rule_func = np.vectorize(rule_func, otypes=[np.float64])
+            return lambda context: rule_func(**context)
         
         else:
-            raise ValueError(f"Step '{step.id}' has no expression or rule_engine")
+            return fail(ValueError(f"Step '{step.id}' has no expression or rule_engine"))
+    
+    def _execute_step(self, step: CalculatorStep, run: Callable[[Dict[str, Any]], Any]) -> StepTrace:
+        """Execute a single calculation step."""
+        input_values = dict(self.context)  # Snapshot of current context
+        result = run(self.context)
         
         # Store result in context for subsequent steps
         self.context[step.id] = result
@@ -421,6 +551,32 @@ class CalculatorEngine:
         )
 
 
+# Engines built in this (worker) process, by version id; versions never change once created
+_ENGINE_CACHE_SIZE = 256
+_engines: "OrderedDict[str, CalculatorEngine]" = OrderedDict()
+
+
+def execute_version(
+    version_id: str, inputs: Dict[str, Any], definition: Optional[CalculatorDefinition] = None
+) -> Optional[CalculatorExecutionResult]:
+    """
+    Run a calculator version on this process's cached engine (module-level so
+    ProcessPoolExecutor workers can call it). Returns None when the version is not
+    cached here and no definition was passed; the caller then resends with the definition.
+    """
+    engine = _engines.get(version_id)
+    if engine is None:
+        if definition is None:
+            return None
+        engine = CalculatorEngine(definition)
+        _engines[version_id] = engine
+        if len(_engines) > _ENGINE_CACHE_SIZE:
+            _engines.popitem(last=False)
+    else:
+        _engines.move_to_end(version_id)
+    return engine.execute(inputs)
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -4,11 +4,12 @@ Multi-agent system for conversational calculator creation.
 """
 import os
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
 from datetime import datetime
-from openai import OpenAI
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
+from http_client import get_http_client
 from calculator_schemas import (
     CalculatorDefinition, CalculatorInput, CalculatorStep,
     CalculatorCategory, ConversationState, ConversationMessage,
@@ -17,8 +18,27 @@ from calculator_schemas import (
 
 load_dotenv()
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Async OpenAI client over the shared keep-alive pool (http_client); created lazily
+# on the running event loop and dropped by the app lifespan (see close_client)
+client = None
+
+
+def get_client() -> AsyncOpenAI:
+    """Return the shared async OpenAI client, creating it on first use."""
+    global client
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            timeout=60,
+            http_client=get_http_client()
+        )
+    return client
+
+
+async def close_client() -> None:
+    """Drop the OpenAI client (its connection pool is closed with the shared http_client)."""
+    global client
+    client = None
 
 
 # ============================================================================
@@ -154,12 +174,14 @@ IMPORTANT RULES & SUPPORTED SYNTAX:
 
 Respond ONLY with the corrected valid JSON. No markdown."""
 
+RESULT_EXPLANATION_SYSTEM_PROMPT = "You are a financial expert explaining calculation results to users. Be clear, helpful, and use simple language."
+
 
 # ============================================================================
 # AGENT FUNCTIONS
 # ============================================================================
 
-def run_elicitation_agent(
+async def run_elicitation_agent(
     description: str,
     conversation_history: List[Dict[str, str]]
 ) -> Dict[str, Any]:
@@ -175,7 +197,7 @@ def run_elicitation_agent(
         messages.append({"role": msg["role"], "content": msg["content"]})
     
     try:
-        response = client.chat.completions.create(
+        response = await get_client().chat.completions.create(
             model="gpt-4o",
             messages=messages,
             temperature=0.7,
@@ -202,7 +224,7 @@ def run_elicitation_agent(
         }
 
 
-def run_generator_agent(requirements: str) -> Dict[str, Any]:
+async def run_generator_agent(requirements: str) -> Dict[str, Any]:
     """Run the generator agent to create calculator JSON."""
     
     messages = [
@@ -211,7 +233,7 @@ def run_generator_agent(requirements: str) -> Dict[str, Any]:
     ]
     
     try:
-        response = client.chat.completions.create(
+        response = await get_client().chat.completions.create(
             model="gpt-4o",
             messages=messages,
             temperature=0.3,
@@ -242,7 +264,7 @@ def run_generator_agent(requirements: str) -> Dict[str, Any]:
         }
 
 
-def run_validation_agent(definition: CalculatorDefinition) -> Dict[str, Any]:
+async def run_validation_agent(definition: CalculatorDefinition) -> Dict[str, Any]:
     """Run the validation agent to check calculator definition."""
     
     # First, do programmatic validation
@@ -276,11 +298,11 @@ def run_validation_agent(definition: CalculatorDefinition) -> Dict[str, Any]:
     # Run AI validation for semantic checks
     messages = [
         {"role": "system", "content": VALIDATION_PROMPT},
-        {"role": "user", "content": f"Validate this calculator:\n{json.dumps(definition.dict(), indent=2)}"}
+        {"role": "user", "content": f"Validate this calculator:\n{json.dumps(definition.model_dump(), indent=2)}"}
     ]
     
     try:
-        response = client.chat.completions.create(
+        response = await get_client().chat.completions.create(
             model="gpt-4o",
             messages=messages,
             temperature=0.2,
@@ -302,16 +324,16 @@ def run_validation_agent(definition: CalculatorDefinition) -> Dict[str, Any]:
         return {"success": True, "valid": True, "errors": errors}
 
 
-def run_explanation_agent(definition: CalculatorDefinition) -> Dict[str, Any]:
+async def run_explanation_agent(definition: CalculatorDefinition) -> Dict[str, Any]:
     """Run the explanation agent to generate documentation."""
     
     messages = [
         {"role": "system", "content": EXPLANATION_PROMPT},
-        {"role": "user", "content": f"Generate documentation for this calculator:\n{json.dumps(definition.dict(), indent=2)}"}
+        {"role": "user", "content": f"Generate documentation for this calculator:\n{json.dumps(definition.model_dump(), indent=2)}"}
     ]
     
     try:
-        response = client.chat.completions.create(
+        response = await get_client().chat.completions.create(
             model="gpt-4o",
             messages=messages,
             temperature=0.5,
@@ -341,7 +363,7 @@ def run_explanation_agent(definition: CalculatorDefinition) -> Dict[str, Any]:
         }
 
 
-def run_healer_agent(
+async def run_healer_agent(
     requirements: str,
     invalid_definition: Dict[str, Any],
     errors: List[str]
@@ -367,7 +389,7 @@ Provide the corrected JSON."""
     ]
     
     try:
-        response = client.chat.completions.create(
+        response = await get_client().chat.completions.create(
             model="gpt-4o",
             messages=messages,
             temperature=0.2,
@@ -392,15 +414,15 @@ Provide the corrected JSON."""
             "error": str(e)
         }
 
-def generate_result_explanation(
+
+def _result_explanation_prompt(
     definition: CalculatorDefinition,
     inputs: Dict[str, Any],
     outputs: Dict[str, Any],
     trace: List[Dict[str, Any]]
-) -> Dict[str, Any]:
-    """Generate AI explanation of calculation results."""
-    
-    prompt = f"""Explain this calculation result in simple terms.
+) -> str:
+    """Build the user prompt for explaining a calculation result."""
+    return f"""Explain this calculation result in simple terms.
 
 Calculator: {definition.name}
 Description: {definition.description}
@@ -422,11 +444,21 @@ Provide:
 
 Use Indian Rupees (₹) for currency. Be helpful and conversational."""
 
+
+async def generate_result_explanation(
+    definition: CalculatorDefinition,
+    inputs: Dict[str, Any],
+    outputs: Dict[str, Any],
+    trace: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Generate AI explanation of calculation results."""
+    prompt = _result_explanation_prompt(definition, inputs, outputs, trace)
+    
     try:
-        response = client.chat.completions.create(
+        response = await get_client().chat.completions.create(
             model="gpt-4o",
             messages=[
-                {"role": "system", "content": "You are a financial expert explaining calculation results to users. Be clear, helpful, and use simple language."},
+                {"role": "system", "content": RESULT_EXPLANATION_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.6,
@@ -446,6 +478,35 @@ Use Indian Rupees (₹) for currency. Be helpful and conversational."""
         }
 
 
+async def stream_result_explanation(
+    definition: CalculatorDefinition,
+    inputs: Dict[str, Any],
+    outputs: Dict[str, Any],
+    trace: List[Dict[str, Any]]
+) -> AsyncIterator[str]:
+    """Stream the AI explanation of calculation results as text chunks."""
+    prompt = _result_explanation_prompt(definition, inputs, outputs, trace)
+    
+    try:
+        stream = await get_client().chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": RESULT_EXPLANATION_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.6,
+            max_tokens=1000,
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    except Exception as e:
+        print(f"Explanation stream failed: {e}")
+        yield f"Calculation completed successfully. Your results: {json.dumps(outputs)}"
+
+
 # ============================================================================
 # CONVERSATION ORCHESTRATOR
 # ============================================================================
@@ -456,7 +517,7 @@ class CalculatorGenerationOrchestrator:
     def __init__(self):
         self.conversations: Dict[str, Dict] = {}  # In-memory cache (use DB in production)
     
-    def start_generation(
+    async def start_generation(
         self,
         description: str,
         category: Optional[str] = None,
@@ -480,7 +541,7 @@ class CalculatorGenerationOrchestrator:
         }
         
         # Run elicitation agent
-        result = run_elicitation_agent(description, [])
+        result = await run_elicitation_agent(description, [])
         
         # Store assistant message
         self.conversations[conversation_id]["messages"].append({
@@ -491,7 +552,7 @@ class CalculatorGenerationOrchestrator:
         
         # Check if requirements already complete (simple request)
         if result.get("is_complete"):
-            return self._advance_to_generation(conversation_id, result["requirements"])
+            return await self._advance_to_generation(conversation_id, result["requirements"])
         
         return CalculatorGenerationResponse(
             conversation_id=conversation_id,
@@ -503,7 +564,7 @@ class CalculatorGenerationOrchestrator:
             is_complete=False
         )
     
-    def continue_generation(
+    async def continue_generation(
         self,
         conversation_id: str,
         user_message: str
@@ -534,7 +595,7 @@ class CalculatorGenerationOrchestrator:
         
         if current_state == ConversationState.ELICITING:
             # Continue elicitation
-            result = run_elicitation_agent(conv["description"], conv["messages"])
+            result = await run_elicitation_agent(conv["description"], conv["messages"])
             
             conv["messages"].append({
                 "role": "assistant",
@@ -543,7 +604,7 @@ class CalculatorGenerationOrchestrator:
             })
             
             if result.get("is_complete"):
-                return self._advance_to_generation(conversation_id, result["requirements"])
+                return await self._advance_to_generation(conversation_id, result["requirements"])
             
             return self._build_response(conversation_id)
         
@@ -560,11 +621,11 @@ class CalculatorGenerationOrchestrator:
             else:
                 # User has feedback - regenerate
                 conv["requirements"] = f"{conv['requirements']}\n\nAdditional feedback: {user_message}"
-                return self._advance_to_generation(conversation_id, conv["requirements"])
+                return await self._advance_to_generation(conversation_id, conv["requirements"])
         
         return self._build_response(conversation_id)
     
-    def _advance_to_generation(
+    async def _advance_to_generation(
         self,
         conversation_id: str,
         requirements: str
@@ -575,7 +636,7 @@ class CalculatorGenerationOrchestrator:
         conv["state"] = ConversationState.GENERATING
         
         # Generate calculator
-        gen_result = run_generator_agent(requirements)
+        gen_result = await run_generator_agent(requirements)
         
         if not gen_result["success"]:
             conv["messages"].append({
@@ -587,31 +648,31 @@ class CalculatorGenerationOrchestrator:
             return self._build_response(conversation_id)
         
         definition = gen_result["definition"]
-        conv["draft_definition"] = definition.dict()
+        conv["draft_definition"] = definition.model_dump()
         
         # Validate
         conv["state"] = ConversationState.VALIDATING
-        val_result = run_validation_agent(definition)
+        val_result = await run_validation_agent(definition)
         
         if not val_result["valid"]:
             # AUTO-HEAL ATTEMPT
             print(f"Validation failed. Attempting to heal... Errors: {val_result['errors']}")
             
-            heal_result = run_healer_agent(
+            heal_result = await run_healer_agent(
                 requirements=conv["requirements"],
-                invalid_definition=definition.dict(),
+                invalid_definition=definition.model_dump(),
                 errors=val_result["errors"]
             )
             
             if heal_result["success"]:
                 # Re-validate the healed definition
                 healed_definition = heal_result["definition"]
-                reval_result = run_validation_agent(healed_definition)
+                reval_result = await run_validation_agent(healed_definition)
                 
                 if reval_result["valid"]:
                     print("Healing successful!")
                     definition = healed_definition  # Use healed definition
-                    conv["draft_definition"] = definition.dict()
+                    conv["draft_definition"] = definition.model_dump()
                     conv["validation_errors"] = []
                 else:
                     print(f"Healing failed. Remaining errors: {reval_result['errors']}")
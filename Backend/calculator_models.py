@@ -4,8 +4,9 @@ Stores calculator definitions, versions, and execution logs.
 """
 from sqlalchemy import (
     Boolean, Column, ForeignKey, Integer, String, Float,
-    DateTime, Text, JSON
+    DateTime, Text, JSON, Index
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -45,7 +46,7 @@ class CalculatorVersion(Base):
     id = Column(String, primary_key=True, index=True, default=generate_uuid)
     calculator_id = Column(String, ForeignKey("calculators.id"), nullable=False)
     version = Column(String, nullable=False)  # e.g., "1.0", "1.1", "2.0"
-    definition_json = Column(JSON, nullable=False)  # Full CalculatorDefinition as JSON
+    definition_json = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)  # Full CalculatorDefinition as JSON
     status = Column(String, default="draft")  # draft, pending_approval, approved, deprecated
     created_by = Column(String, nullable=True)  # Admin who created this version
     approved_by = Column(String, nullable=True)  # Admin who approved
@@ -55,6 +56,14 @@ class CalculatorVersion(Base):
     # Relationships
     calculator = relationship("Calculator", back_populates="versions")
     logs = relationship("CalculationLog", back_populates="version")
+    
+    __table_args__ = (
+        # Containment queries over definitions (e.g. by input name); JSONB/GIN exist only on Postgres
+        Index(
+            "ix_calculator_versions_definition_gin", "definition_json",
+            postgresql_using="gin", postgresql_ops={"definition_json": "jsonb_path_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
 
 
 class CalculationLog(Base):
@@ -66,7 +75,6 @@ class CalculationLog(Base):
     version_id = Column(String, ForeignKey("calculator_versions.id"), nullable=False)
     inputs_json = Column(JSON, nullable=False)  # Input values
     outputs_json = Column(JSON, nullable=False)  # Output values
-    trace_json = Column(JSON, nullable=False)  # Full calculation trace
     execution_time_ms = Column(Float, nullable=True)
     user_id = Column(String, nullable=True)  # Optional: who ran this
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -74,6 +82,21 @@ class CalculationLog(Base):
     # Relationships
     calculator = relationship("Calculator", back_populates="logs")
     version = relationship("CalculatorVersion", back_populates="logs")
+    trace = relationship("CalculationLogTrace", back_populates="log", uselist=False, cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index("ix_calculation_logs_calculator_created", "calculator_id", "created_at"),
+    )
+
+
+class CalculationLogTrace(Base):
+    """Full calculation trace for a log entry, kept apart so the log table stays narrow."""
+    __tablename__ = "calculation_log_traces"
+    
+    log_id = Column(String, ForeignKey("calculation_logs.id"), primary_key=True)
+    trace_json = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
+    
+    log = relationship("CalculationLog", back_populates="trace")
 
 
 # ============================================================================
@@ -2,9 +2,11 @@
 CRUD Operations for AI Financial Planner
 Provides database operations for all entities.
 """
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
-from datetime import date
+from datetime import date, datetime
 import models
 import schemas
 from enums import RelationshipType, TargetType, InvestmentType, LiabilityType, AccountType, PolicyType
@@ -14,7 +16,7 @@ from enums import RelationshipType, TargetType, InvestmentType, LiabilityType, A
 # USER OPERATIONS
 # ============================================================================
 
-def create_user(db: Session, user_data: schemas.PrimaryUser, contact: Optional[schemas.ContactDetails] = None, address: Optional[str] = None) -> models.User:
+async def create_user(db: AsyncSession, user_data: schemas.PrimaryUser, contact: Optional[schemas.ContactDetails] = None, address: Optional[str] = None) -> models.User:
     """Create a new user profile."""
     db_user = models.User(
         name=user_data.name,
@@ -28,24 +30,52 @@ def create_user(db: Session, user_data: schemas.PrimaryUser, contact: Optional[s
         organisation=contact.organisation if contact else None
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 
-def get_user(db: Session, user_id: str) -> Optional[models.User]:
+async def get_user(db: AsyncSession, user_id: str) -> Optional[models.User]:
     """Get user by ID."""
-    return db.query(models.User).filter(models.User.id == user_id).first()
+    return (await db.execute(select(models.User).where(models.User.id == user_id))).scalar_one_or_none()
 
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[models.User]:
+async def touch_user(db: AsyncSession, user_id: str) -> None:
+    """Bump the user's updated_at so cached analyses keyed on it go stale."""
+    await db.execute(
+        update(models.User).where(models.User.id == user_id).values(updated_at=datetime.utcnow())
+    )
+
+
+async def get_user_full(db: AsyncSession, user_id: str) -> Optional[models.User]:
+    """Get user by ID with every related table eager-loaded in one round of queries."""
+    result = await db.execute(
+        select(models.User)
+        .options(
+            selectinload(models.User.spouse),
+            selectinload(models.User.family_members),
+            selectinload(models.User.goals),
+            selectinload(models.User.real_estate_assets),
+            selectinload(models.User.bank_accounts),
+            selectinload(models.User.investment_assets),
+            selectinload(models.User.insurance_policies),
+            selectinload(models.User.liabilities),
+            selectinload(models.User.cash_flow),
+            selectinload(models.User.assumptions)
+        )
+        .where(models.User.id == user_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[models.User]:
     """Get all users (paginated)."""
-    return db.query(models.User).offset(skip).limit(limit).all()
+    return (await db.execute(select(models.User).offset(skip).limit(limit))).scalars().all()
 
 
-def update_user(db: Session, user_id: str, user_data: dict) -> Optional[models.User]:
+async def update_user(db: AsyncSession, user_id: str, user_data: dict) -> Optional[models.User]:
     """Update user profile."""
-    db_user = get_user(db, user_id)
+    db_user = await get_user(db, user_id)
     if not db_user:
         return None
     
@@ -53,19 +83,19 @@ def update_user(db: Session, user_id: str, user_data: dict) -> Optional[models.U
         if hasattr(db_user, key):
             setattr(db_user, key, value)
     
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 
-def delete_user(db: Session, user_id: str) -> bool:
+async def delete_user(db: AsyncSession, user_id: str) -> bool:
     """Delete user and all related data."""
-    db_user = get_user(db, user_id)
+    db_user = await get_user(db, user_id)
     if not db_user:
         return False
     
-    db.delete(db_user)
-    db.commit()
+    await db.delete(db_user)
+    await db.commit()
     return True
 
 
@@ -73,7 +103,7 @@ def delete_user(db: Session, user_id: str) -> bool:
 # SPOUSE OPERATIONS
 # ============================================================================
 
-def create_spouse(db: Session, user_id: str, spouse_data: schemas.SpouseInfo) -> models.Spouse:
+async def create_spouse(db: AsyncSession, user_id: str, spouse_data: schemas.SpouseInfo) -> models.Spouse:
     """Create spouse record."""
     db_spouse = models.Spouse(
         user_id=user_id,
@@ -82,19 +112,20 @@ def create_spouse(db: Session, user_id: str, spouse_data: schemas.SpouseInfo) ->
         working_status=spouse_data.working_status
     )
     db.add(db_spouse)
-    db.commit()
-    db.refresh(db_spouse)
+    await touch_user(db, user_id)
+    await db.commit()
+    await db.refresh(db_spouse)
     return db_spouse
 
 
-def get_spouse(db: Session, user_id: str) -> Optional[models.Spouse]:
+async def get_spouse(db: AsyncSession, user_id: str) -> Optional[models.Spouse]:
     """Get spouse by user ID."""
-    return db.query(models.Spouse).filter(models.Spouse.user_id == user_id).first()
+    return (await db.execute(select(models.Spouse).where(models.Spouse.user_id == user_id))).scalars().first()
 
 
-def update_spouse(db: Session, user_id: str, spouse_data: dict) -> Optional[models.Spouse]:
+async def update_spouse(db: AsyncSession, user_id: str, spouse_data: dict) -> Optional[models.Spouse]:
     """Update spouse record."""
-    db_spouse = get_spouse(db, user_id)
+    db_spouse = await get_spouse(db, user_id)
     if not db_spouse:
         return None
     
@@ -102,19 +133,21 @@ def update_spouse(db: Session, user_id: str, spouse_data: dict) -> Optional[mode
         if hasattr(db_spouse, key):
             setattr(db_spouse, key, value)
     
-    db.commit()
-    db.refresh(db_spouse)
+    await touch_user(db, db_spouse.user_id)
+    await db.commit()
+    await db.refresh(db_spouse)
     return db_spouse
 
 
-def delete_spouse(db: Session, user_id: str) -> bool:
+async def delete_spouse(db: AsyncSession, user_id: str) -> bool:
     """Delete spouse record."""
-    db_spouse = get_spouse(db, user_id)
+    db_spouse = await get_spouse(db, user_id)
     if not db_spouse:
         return False
     
-    db.delete(db_spouse)
-    db.commit()
+    await db.delete(db_spouse)
+    await touch_user(db, db_spouse.user_id)
+    await db.commit()
     return True
 
 
@@ -122,7 +155,7 @@ def delete_spouse(db: Session, user_id: str) -> bool:
 # FAMILY MEMBER OPERATIONS
 # ============================================================================
 
-def create_family_member(db: Session, user_id: str, member_data: schemas.FamilyMember) -> models.FamilyMember:
+async def create_family_member(db: AsyncSession, user_id: str, member_data: schemas.FamilyMember) -> models.FamilyMember:
     """Create a family member."""
     db_member = models.FamilyMember(
         user_id=user_id,
@@ -133,24 +166,25 @@ def create_family_member(db: Session, user_id: str, member_data: schemas.FamilyM
         expected_retirement_age=member_data.expected_retirement_age
     )
     db.add(db_member)
-    db.commit()
-    db.refresh(db_member)
+    await touch_user(db, user_id)
+    await db.commit()
+    await db.refresh(db_member)
     return db_member
 
 
-def get_family_members(db: Session, user_id: str) -> List[models.FamilyMember]:
+async def get_family_members(db: AsyncSession, user_id: str) -> List[models.FamilyMember]:
     """Get all family members for a user."""
-    return db.query(models.FamilyMember).filter(models.FamilyMember.user_id == user_id).all()
+    return (await db.execute(select(models.FamilyMember).where(models.FamilyMember.user_id == user_id))).scalars().all()
 
 
-def get_family_member(db: Session, member_id: str) -> Optional[models.FamilyMember]:
+async def get_family_member(db: AsyncSession, member_id: str) -> Optional[models.FamilyMember]:
     """Get a specific family member."""
-    return db.query(models.FamilyMember).filter(models.FamilyMember.id == member_id).first()
+    return (await db.execute(select(models.FamilyMember).where(models.FamilyMember.id == member_id))).scalar_one_or_none()
 
 
-def update_family_member(db: Session, member_id: str, member_data: dict) -> Optional[models.FamilyMember]:
+async def update_family_member(db: AsyncSession, member_id: str, member_data: dict) -> Optional[models.FamilyMember]:
     """Update a family member."""
-    db_member = get_family_member(db, member_id)
+    db_member = await get_family_member(db, member_id)
     if not db_member:
         return None
     
@@ -158,19 +192,21 @@ def update_family_member(db: Session, member_id: str, member_data: dict) -> Opti
         if hasattr(db_member, key):
             setattr(db_member, key, value)
     
-    db.commit()
-    db.refresh(db_member)
+    await touch_user(db, db_member.user_id)
+    await db.commit()
+    await db.refresh(db_member)
     return db_member
 
 
-def delete_family_member(db: Session, member_id: str) -> bool:
+async def delete_family_member(db: AsyncSession, member_id: str) -> bool:
     """Delete a family member."""
-    db_member = get_family_member(db, member_id)
+    db_member = await get_family_member(db, member_id)
     if not db_member:
         return False
     
-    db.delete(db_member)
-    db.commit()
+    await db.delete(db_member)
+    await touch_user(db, db_member.user_id)
+    await db.commit()
     return True
 
 
@@ -178,7 +214,7 @@ def delete_family_member(db: Session, member_id: str) -> bool:
 # GOAL OPERATIONS
 # ============================================================================
 
-def create_goal(db: Session, user_id: str, goal_data: schemas.Goal) -> models.Goal:
+async def create_goal(db: AsyncSession, user_id: str, goal_data: schemas.Goal) -> models.Goal:
     """Create a financial goal."""
     db_goal = models.Goal(
         user_id=user_id,
@@ -189,24 +225,25 @@ def create_goal(db: Session, user_id: str, goal_data: schemas.Goal) -> models.Go
         target_value=goal_data.target_value
     )
     db.add(db_goal)
-    db.commit()
-    db.refresh(db_goal)
+    await touch_user(db, user_id)
+    await db.commit()
+    await db.refresh(db_goal)
     return db_goal
 
 
-def get_goals(db: Session, user_id: str) -> List[models.Goal]:
+async def get_goals(db: AsyncSession, user_id: str) -> List[models.Goal]:
     """Get all goals for a user."""
-    return db.query(models.Goal).filter(models.Goal.user_id == user_id).all()
+    return (await db.execute(select(models.Goal).where(models.Goal.user_id == user_id))).scalars().all()
 
 
-def get_goal(db: Session, goal_id: str) -> Optional[models.Goal]:
+async def get_goal(db: AsyncSession, goal_id: str) -> Optional[models.Goal]:
     """Get a specific goal."""
-    return db.query(models.Goal).filter(models.Goal.id == goal_id).first()
+    return (await db.execute(select(models.Goal).where(models.Goal.id == goal_id))).scalar_one_or_none()
 
 
-def update_goal(db: Session, goal_id: str, goal_data: dict) -> Optional[models.Goal]:
+async def update_goal(db: AsyncSession, goal_id: str, goal_data: dict) -> Optional[models.Goal]:
     """Update a goal."""
-    db_goal = get_goal(db, goal_id)
+    db_goal = await get_goal(db, goal_id)
     if not db_goal:
         return None
     
@@ -214,19 +251,21 @@ def update_goal(db: Session, goal_id: str, goal_data: dict) -> Optional[models.G
         if hasattr(db_goal, key):
             setattr(db_goal, key, value)
     
-    db.commit()
-    db.refresh(db_goal)
+    await touch_user(db, db_goal.user_id)
+    await db.commit()
+    await db.refresh(db_goal)
     return db_goal
 
 
-def delete_goal(db: Session, goal_id: str) -> bool:
+async def delete_goal(db: AsyncSession, goal_id: str) -> bool:
     """Delete a goal."""
-    db_goal = get_goal(db, goal_id)
+    db_goal = await get_goal(db, goal_id)
     if not db_goal:
         return False
     
-    db.delete(db_goal)
-    db.commit()
+    await db.delete(db_goal)
+    await touch_user(db, db_goal.user_id)
+    await db.commit()
     return True
 
 
@@ -234,7 +273,7 @@ def delete_goal(db: Session, goal_id: str) -> bool:
 # REAL ESTATE ASSET OPERATIONS
 # ============================================================================
 
-def create_real_estate(db: Session, user_id: str, asset_data: schemas.RealEstateAsset) -> models.RealEstateAsset:
+async def create_real_estate(db: AsyncSession, user_id: str, asset_data: schemas.RealEstateAsset) -> models.RealEstateAsset:
     """Create a real estate asset."""
     db_asset = models.RealEstateAsset(
         user_id=user_id,
@@ -248,24 +287,25 @@ def create_real_estate(db: Session, user_id: str, asset_data: schemas.RealEstate
         remarks=asset_data.remarks
     )
     db.add(db_asset)
-    db.commit()
-    db.refresh(db_asset)
+    await touch_user(db, user_id)
+    await db.commit()
+    await db.refresh(db_asset)
     return db_asset
 
 
-def get_real_estate_assets(db: Session, user_id: str) -> List[models.RealEstateAsset]:
+async def get_real_estate_assets(db: AsyncSession, user_id: str) -> List[models.RealEstateAsset]:
     """Get all real estate assets for a user."""
-    return db.query(models.RealEstateAsset).filter(models.RealEstateAsset.user_id == user_id).all()
+    return (await db.execute(select(models.RealEstateAsset).where(models.RealEstateAsset.user_id == user_id))).scalars().all()
 
 
-def get_real_estate(db: Session, asset_id: str) -> Optional[models.RealEstateAsset]:
+async def get_real_estate(db: AsyncSession, asset_id: str) -> Optional[models.RealEstateAsset]:
     """Get a specific real estate asset."""
-    return db.query(models.RealEstateAsset).filter(models.RealEstateAsset.id == asset_id).first()
+    return (await db.execute(select(models.RealEstateAsset).where(models.RealEstateAsset.id == asset_id))).scalar_one_or_none()
 
 
-def update_real_estate(db: Session, asset_id: str, asset_data: dict) -> Optional[models.RealEstateAsset]:
+async def update_real_estate(db: AsyncSession, asset_id: str, asset_data: dict) -> Optional[models.RealEstateAsset]:
     """Update a real estate asset."""
-    db_asset = get_real_estate(db, asset_id)
+    db_asset = await get_real_estate(db, asset_id)
     if not db_asset:
         return None
     
@@ -273,19 +313,21 @@ def update_real_estate(db: Session, asset_id: str, asset_data: dict) -> Optional
         if hasattr(db_asset, key):
             setattr(db_asset, key, value)
     
-    db.commit()
-    db.refresh(db_asset)
+    await touch_user(db, db_asset.user_id)
+    await db.commit()
+    await db.refresh(db_asset)
     return db_asset
 
 
-def delete_real_estate(db: Session, asset_id: str) -> bool:
+async def delete_real_estate(db: AsyncSession, asset_id: str) -> bool:
     """Delete a real estate asset."""
-    db_asset = get_real_estate(db, asset_id)
+    db_asset = await get_real_estate(db, asset_id)
     if not db_asset:
         return False
     
-    db.delete(db_asset)
-    db.commit()
+    await db.delete(db_asset)
+    await touch_user(db, db_asset.user_id)
+    await db.commit()
     return True
 
 
@@ -293,7 +335,7 @@ def delete_real_estate(db: Session, asset_id: str) -> bool:
 # BANK ACCOUNT OPERATIONS
 # ============================================================================
 
-def create_bank_account(db: Session, user_id: str, account_data: schemas.BankAccount) -> models.BankAccount:
+async def create_bank_account(db: AsyncSession, user_id: str, account_data: schemas.BankAccount) -> models.BankAccount:
     """Create a bank account."""
     db_account = models.BankAccount(
         user_id=user_id,
@@ -305,24 +347,25 @@ def create_bank_account(db: Session, user_id: str, account_data: schemas.BankAcc
         remarks=account_data.remarks
     )
     db.add(db_account)
-    db.commit()
-    db.refresh(db_account)
+    await touch_user(db, user_id)
+    await db.commit()
+    await db.refresh(db_account)
     return db_account
 
 
-def get_bank_accounts(db: Session, user_id: str) -> List[models.BankAccount]:
+async def get_bank_accounts(db: AsyncSession, user_id: str) -> List[models.BankAccount]:
     """Get all bank accounts for a user."""
-    return db.query(models.BankAccount).filter(models.BankAccount.user_id == user_id).all()
+    return (await db.execute(select(models.BankAccount).where(models.BankAccount.user_id == user_id))).scalars().all()
 
 
-def get_bank_account(db: Session, account_id: str) -> Optional[models.BankAccount]:
+async def get_bank_account(db: AsyncSession, account_id: str) -> Optional[models.BankAccount]:
     """Get a specific bank account."""
-    return db.query(models.BankAccount).filter(models.BankAccount.id == account_id).first()
+    return (await db.execute(select(models.BankAccount).where(models.BankAccount.id == account_id))).scalar_one_or_none()
 
 
-def update_bank_account(db: Session, account_id: str, account_data: dict) -> Optional[models.BankAccount]:
+async def update_bank_account(db: AsyncSession, account_id: str, account_data: dict) -> Optional[models.BankAccount]:
     """Update a bank account."""
-    db_account = get_bank_account(db, account_id)
+    db_account = await get_bank_account(db, account_id)
     if not db_account:
         return None
     
@@ -330,19 +373,21 @@ def update_bank_account(db: Session, account_id: str, account_data: dict) -> Opt
         if hasattr(db_account, key):
             setattr(db_account, key, value)
     
-    db.commit()
-    db.refresh(db_account)
+    await touch_user(db, db_account.user_id)
+    await db.commit()
+    await db.refresh(db_account)
     return db_account
 
 
-def delete_bank_account(db: Session, account_id: str) -> bool:
+async def delete_bank_account(db: AsyncSession, account_id: str) -> bool:
     """Delete a bank account."""
-    db_account = get_bank_account(db, account_id)
+    db_account = await get_bank_account(db, account_id)
     if not db_account:
         return False
     
-    db.delete(db_account)
-    db.commit()
+    await db.delete(db_account)
+    await touch_user(db, db_account.user_id)
+    await db.commit()
     return True
 
 
@@ -350,7 +395,7 @@ def delete_bank_account(db: Session, account_id: str) -> bool:
 # INVESTMENT ASSET OPERATIONS
 # ============================================================================
 
-def create_investment(db: Session, user_id: str, investment_data: schemas.InvestmentAsset) -> models.InvestmentAsset:
+async def create_investment(db: AsyncSession, user_id: str, investment_data: schemas.InvestmentAsset) -> models.InvestmentAsset:
     """Create an investment asset."""
     db_investment = models.InvestmentAsset(
         user_id=user_id,
@@ -363,24 +408,25 @@ def create_investment(db: Session, user_id: str, investment_data: schemas.Invest
         remarks=investment_data.remarks
     )
     db.add(db_investment)
-    db.commit()
-    db.refresh(db_investment)
+    await touch_user(db, user_id)
+    await db.commit()
+    await db.refresh(db_investment)
     return db_investment
 
 
-def get_investments(db: Session, user_id: str) -> List[models.InvestmentAsset]:
+async def get_investments(db: AsyncSession, user_id: str) -> List[models.InvestmentAsset]:
     """Get all investments for a user."""
-    return db.query(models.InvestmentAsset).filter(models.InvestmentAsset.user_id == user_id).all()
+    return (await db.execute(select(models.InvestmentAsset).where(models.InvestmentAsset.user_id == user_id))).scalars().all()
 
 
-def get_investment(db: Session, investment_id: str) -> Optional[models.InvestmentAsset]:
+async def get_investment(db: AsyncSession, investment_id: str) -> Optional[models.InvestmentAsset]:
     """Get a specific investment."""
-    return db.query(models.InvestmentAsset).filter(models.InvestmentAsset.id == investment_id).first()
+    return (await db.execute(select(models.InvestmentAsset).where(models.InvestmentAsset.id == investment_id))).scalar_one_or_none()
 
 
-def update_investment(db: Session, investment_id: str, investment_data: dict) -> Optional[models.InvestmentAsset]:
+async def update_investment(db: AsyncSession, investment_id: str, investment_data: dict) -> Optional[models.InvestmentAsset]:
     """Update an investment."""
-    db_investment = get_investment(db, investment_id)
+    db_investment = await get_investment(db, investment_id)
     if not db_investment:
         return None
     
@@ -388,19 +434,21 @@ def update_investment(db: Session, investment_id: str, investment_data: dict) ->
         if hasattr(db_investment, key):
             setattr(db_investment, key, value)
     
-    db.commit()
-    db.refresh(db_investment)
+    await touch_user(db, db_investment.user_id)
+    await db.commit()
+    await db.refresh(db_investment)
     return db_investment
 
 
-def delete_investment(db: Session, investment_id: str) -> bool:
+async def delete_investment(db: AsyncSession, investment_id: str) -> bool:
     """Delete an investment."""
-    db_investment = get_investment(db, investment_id)
+    db_investment = await get_investment(db, investment_id)
     if not db_investment:
         return False
     
-    db.delete(db_investment)
-    db.commit()
+    await db.delete(db_investment)
+    await touch_user(db, db_investment.user_id)
+    await db.commit()
     return True
 
 
@@ -408,7 +456,7 @@ def delete_investment(db: Session, investment_id: str) -> bool:
 # INSURANCE POLICY OPERATIONS
 # ============================================================================
 
-def create_insurance(db: Session, user_id: str, policy_data: schemas.InsurancePolicy) -> models.InsurancePolicy:
+async def create_insurance(db: AsyncSession, user_id: str, policy_data: schemas.InsurancePolicy) -> models.InsurancePolicy:
     """Create an insurance policy."""
     db_policy = models.InsurancePolicy(
         user_id=user_id,
@@ -424,24 +472,25 @@ def create_insurance(db: Session, user_id: str, policy_data: schemas.InsurancePo
         remarks=policy_data.remarks
     )
     db.add(db_policy)
-    db.commit()
-    db.refresh(db_policy)
+    await touch_user(db, user_id)
+    await db.commit()
+    await db.refresh(db_policy)
     return db_policy
 
 
-def get_insurance_policies(db: Session, user_id: str) -> List[models.InsurancePolicy]:
+async def get_insurance_policies(db: AsyncSession, user_id: str) -> List[models.InsurancePolicy]:
     """Get all insurance policies for a user."""
-    return db.query(models.InsurancePolicy).filter(models.InsurancePolicy.user_id == user_id).all()
+    return (await db.execute(select(models.InsurancePolicy).where(models.InsurancePolicy.user_id == user_id))).scalars().all()
 
 
-def get_insurance(db: Session, policy_id: str) -> Optional[models.InsurancePolicy]:
+async def get_insurance(db: AsyncSession, policy_id: str) -> Optional[models.InsurancePolicy]:
     """Get a specific insurance policy."""
-    return db.query(models.InsurancePolicy).filter(models.InsurancePolicy.id == policy_id).first()
+    return (await db.execute(select(models.InsurancePolicy).where(models.InsurancePolicy.id == policy_id))).scalar_one_or_none()
 
 
-def update_insurance(db: Session, policy_id: str, policy_data: dict) -> Optional[models.InsurancePolicy]:
+async def update_insurance(db: AsyncSession, policy_id: str, policy_data: dict) -> Optional[models.InsurancePolicy]:
     """Update an insurance policy."""
-    db_policy = get_insurance(db, policy_id)
+    db_policy = await get_insurance(db, policy_id)
     if not db_policy:
         return None
     
@@ -449,19 +498,21 @@ def update_insurance(db: Session, policy_id: str, policy_data: dict) -> Optional
         if hasattr(db_policy, key):
             setattr(db_policy, key, value)
     
-    db.commit()
-    db.refresh(db_policy)
+    await touch_user(db, db_policy.user_id)
+    await db.commit()
+    await db.refresh(db_policy)
     return db_policy
 
 
-def delete_insurance(db: Session, policy_id: str) -> bool:
+async def delete_insurance(db: AsyncSession, policy_id: str) -> bool:
     """Delete an insurance policy."""
-    db_policy = get_insurance(db, policy_id)
+    db_policy = await get_insurance(db, policy_id)
     if not db_policy:
         return False
     
-    db.delete(db_policy)
-    db.commit()
+    await db.delete(db_policy)
+    await touch_user(db, db_policy.user_id)
+    await db.commit()
     return True
 
 
@@ -469,7 +520,7 @@ def delete_insurance(db: Session, policy_id: str) -> bool:
 # LIABILITY OPERATIONS
 # ============================================================================
 
-def create_liability(db: Session, user_id: str, liability_data: schemas.Liability) -> models.Liability:
+async def create_liability(db: AsyncSession, user_id: str, liability_data: schemas.Liability) -> models.Liability:
     """Create a liability."""
     db_liability = models.Liability(
         user_id=user_id,
@@ -481,24 +532,25 @@ def create_liability(db: Session, user_id: str, liability_data: schemas.Liabilit
         tenure_months=liability_data.tenure_months
     )
     db.add(db_liability)
-    db.commit()
-    db.refresh(db_liability)
+    await touch_user(db, user_id)
+    await db.commit()
+    await db.refresh(db_liability)
     return db_liability
 
 
-def get_liabilities(db: Session, user_id: str) -> List[models.Liability]:
+async def get_liabilities(db: AsyncSession, user_id: str) -> List[models.Liability]:
     """Get all liabilities for a user."""
-    return db.query(models.Liability).filter(models.Liability.user_id == user_id).all()
+    return (await db.execute(select(models.Liability).where(models.Liability.user_id == user_id))).scalars().all()
 
 
-def get_liability(db: Session, liability_id: str) -> Optional[models.Liability]:
+async def get_liability(db: AsyncSession, liability_id: str) -> Optional[models.Liability]:
     """Get a specific liability."""
-    return db.query(models.Liability).filter(models.Liability.id == liability_id).first()
+    return (await db.execute(select(models.Liability).where(models.Liability.id == liability_id))).scalar_one_or_none()
 
 
-def update_liability(db: Session, liability_id: str, liability_data: dict) -> Optional[models.Liability]:
+async def update_liability(db: AsyncSession, liability_id: str, liability_data: dict) -> Optional[models.Liability]:
     """Update a liability."""
-    db_liability = get_liability(db, liability_id)
+    db_liability = await get_liability(db, liability_id)
     if not db_liability:
         return None
     
@@ -506,19 +558,21 @@ def update_liability(db: Session, liability_id: str, liability_data: dict) -> Op
         if hasattr(db_liability, key):
             setattr(db_liability, key, value)
     
-    db.commit()
-    db.refresh(db_liability)
+    await touch_user(db, db_liability.user_id)
+    await db.commit()
+    await db.refresh(db_liability)
     return db_liability
 
 
-def delete_liability(db: Session, liability_id: str) -> bool:
+async def delete_liability(db: AsyncSession, liability_id: str) -> bool:
     """Delete a liability."""
-    db_liability = get_liability(db, liability_id)
+    db_liability = await get_liability(db, liability_id)
     if not db_liability:
         return False
     
-    db.delete(db_liability)
-    db.commit()
+    await db.delete(db_liability)
+    await touch_user(db, db_liability.user_id)
+    await db.commit()
     return True
 
 
@@ -526,10 +580,10 @@ def delete_liability(db: Session, liability_id: str) -> bool:
 # CASH FLOW OPERATIONS
 # ============================================================================
 
-def create_or_update_cash_flow(db: Session, user_id: str, cash_flow_data: schemas.CashFlow) -> models.CashFlow:
+async def create_or_update_cash_flow(db: AsyncSession, user_id: str, cash_flow_data: schemas.CashFlow) -> models.CashFlow:
     """Create or update cash flow (upsert operation)."""
     # Check if cash flow exists
-    db_cash_flow = db.query(models.CashFlow).filter(models.CashFlow.user_id == user_id).first()
+    db_cash_flow = (await db.execute(select(models.CashFlow).where(models.CashFlow.user_id == user_id))).scalars().first()
     
     inflows = cash_flow_data.inflows
     outflows = cash_flow_data.outflows
@@ -547,34 +601,34 @@ def create_or_update_cash_flow(db: Session, user_id: str, cash_flow_data: schema
         db_cash_flow.lifestyle = outflows.lifestyle
         
         # Update detailed expenses if provided
-        if outflows.essential_details:
+        if outflows.essential_details is not None:
             ed = outflows.essential_details
-            db_cash_flow.house_rent = ed.house_rent
-            db_cash_flow.maintenance = ed.maintenance
-            db_cash_flow.property_tax = ed.property_tax
-            db_cash_flow.utilities = ed.utilities
-            db_cash_flow.groceries = ed.groceries
-            db_cash_flow.transportation = ed.transportation
-            db_cash_flow.medical_expenses = ed.medical_expenses
-            db_cash_flow.children_school_fees = ed.children_school_fees
-            db_cash_flow.insurance_premiums = ed.insurance_premiums
-            db_cash_flow.essential_other = ed.other
+            db_cash_flow.house_rent = ed.get("house_rent", 0)
+            db_cash_flow.maintenance = ed.get("maintenance", 0)
+            db_cash_flow.property_tax = ed.get("property_tax", 0)
+            db_cash_flow.utilities = ed.get("utilities", 0)
+            db_cash_flow.groceries = ed.get("groceries", 0)
+            db_cash_flow.transportation = ed.get("transportation", 0)
+            db_cash_flow.medical_expenses = ed.get("medical_expenses", 0)
+            db_cash_flow.children_school_fees = ed.get("children_school_fees", 0)
+            db_cash_flow.insurance_premiums = ed.get("insurance_premiums", 0)
+            db_cash_flow.essential_other = ed.get("other", 0)
         
-        if outflows.lifestyle_details:
+        if outflows.lifestyle_details is not None:
             ld = outflows.lifestyle_details
-            db_cash_flow.maid_expense = ld.maid_expense
-            db_cash_flow.shopping = ld.shopping
-            db_cash_flow.travel = ld.travel
-            db_cash_flow.dining_entertainment = ld.dining_entertainment
-            db_cash_flow.lifestyle_other = ld.other
+            db_cash_flow.maid_expense = ld.get("maid_expense", 0)
+            db_cash_flow.shopping = ld.get("shopping", 0)
+            db_cash_flow.travel = ld.get("travel", 0)
+            db_cash_flow.dining_entertainment = ld.get("dining_entertainment", 0)
+            db_cash_flow.lifestyle_other = ld.get("other", 0)
         
-        if outflows.investment_details:
+        if outflows.investment_details is not None:
             inv = outflows.investment_details
-            db_cash_flow.mf_sip = inv.mutual_fund_sip
-            db_cash_flow.stock_sip = inv.stock_sip
-            db_cash_flow.rd_contribution = inv.recurring_deposit
-            db_cash_flow.chit_fund = inv.chit_fund
-            db_cash_flow.investment_other = inv.other
+            db_cash_flow.mf_sip = inv.get("mutual_fund_sip", 0)
+            db_cash_flow.stock_sip = inv.get("stock_sip", 0)
+            db_cash_flow.rd_contribution = inv.get("recurring_deposit", 0)
+            db_cash_flow.chit_fund = inv.get("chit_fund", 0)
+            db_cash_flow.investment_other = inv.get("other", 0)
         
         db_cash_flow.linked_emis = outflows.linked_emis
         db_cash_flow.linked_investments = outflows.linked_investments
@@ -594,23 +648,24 @@ def create_or_update_cash_flow(db: Session, user_id: str, cash_flow_data: schema
         )
         db.add(db_cash_flow)
     
-    db.commit()
-    db.refresh(db_cash_flow)
+    await touch_user(db, user_id)
+    await db.commit()
+    await db.refresh(db_cash_flow)
     return db_cash_flow
 
 
-def get_cash_flow(db: Session, user_id: str) -> Optional[models.CashFlow]:
+async def get_cash_flow(db: AsyncSession, user_id: str) -> Optional[models.CashFlow]:
     """Get cash flow for a user."""
-    return db.query(models.CashFlow).filter(models.CashFlow.user_id == user_id).first()
+    return (await db.execute(select(models.CashFlow).where(models.CashFlow.user_id == user_id))).scalars().first()
 
 
 # ============================================================================
 # ASSUMPTIONS OPERATIONS
 # ============================================================================
 
-def create_or_update_assumptions(db: Session, user_id: str, assumptions_data: schemas.Assumptions) -> models.Assumptions:
+async def create_or_update_assumptions(db: AsyncSession, user_id: str, assumptions_data: schemas.Assumptions) -> models.Assumptions:
     """Create or update assumptions (upsert operation)."""
-    db_assumptions = db.query(models.Assumptions).filter(models.Assumptions.user_id == user_id).first()
+    db_assumptions = (await db.execute(select(models.Assumptions).where(models.Assumptions.user_id == user_id))).scalars().first()
     
     if db_assumptions:
         # Update existing
@@ -627,11 +682,12 @@ def create_or_update_assumptions(db: Session, user_id: str, assumptions_data: sc
         )
         db.add(db_assumptions)
     
-    db.commit()
-    db.refresh(db_assumptions)
+    await touch_user(db, user_id)
+    await db.commit()
+    await db.refresh(db_assumptions)
     return db_assumptions
 
 
-def get_assumptions(db: Session, user_id: str) -> Optional[models.Assumptions]:
+async def get_assumptions(db: AsyncSession, user_id: str) -> Optional[models.Assumptions]:
     """Get assumptions for a user."""
-    return db.query(models.Assumptions).filter(models.Assumptions.user_id == user_id).first()
+    return (await db.execute(select(models.Assumptions).where(models.Assumptions.user_id == user_id))).scalars().first()
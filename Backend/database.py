@@ -1,23 +1,81 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from alembic.config import Config as AlembicConfig
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+import logging
 import os
+import time
+
+logger = logging.getLogger(__name__)
 
 # Create a database URL for SQLite
 # In a real production environment, this would be a PostgreSQL URL from environment variables
 SQLALCHEMY_DATABASE_URL = "sqlite:///./financial_planner.db"
 # SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Async driver URL for request handlers (PostgreSQL: "postgresql+asyncpg://...")
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./financial_planner.db"
+# ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Sized for bursty API traffic: keep warm connections instead of reconnecting per burst
+ASYNC_POOL_OPTIONS = dict(pool_size=20, max_overflow=40, pool_recycle=1800, pool_pre_ping=True)
+if ASYNC_DATABASE_URL.startswith("postgresql+asyncpg"):
+    # Reuse server-side prepared statements; JIT only slows these short OLTP queries
+    ASYNC_POOL_OPTIONS["connect_args"] = {
+        "prepared_statement_cache_size": 512,
+        "statement_cache_size": 512,
+        "server_settings": {"jit": "off"},
+    }
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **ASYNC_POOL_OPTIONS)
+
+# Pool saturation monitor: once every connection is checked out, further requests queue
+# for up to pool_timeout, so report it (at most every POOL_WARN_INTERVAL seconds).
+POOL_WARN_INTERVAL = 10.0
+_pool_limit = ASYNC_POOL_OPTIONS["pool_size"] + ASYNC_POOL_OPTIONS["max_overflow"]
+_last_pool_warning = 0.0
+
+@event.listens_for(async_engine.sync_engine, "checkout")
+def _warn_on_pool_saturation(dbapi_connection, connection_record, connection_proxy):
+    global _last_pool_warning
+    checked_out = async_engine.sync_engine.pool.checkedout()
+    now = time.monotonic()
+    if checked_out >= _pool_limit and now - _last_pool_warning > POOL_WARN_INTERVAL:
+        _last_pool_warning = now
+        logger.warning(
+            "Database pool saturated (%d/%d connections checked out); further requests will wait for a connection",
+            checked_out, _pool_limit
+        )
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+_schema_ready = False
+
+def _schema_at_head(connection) -> bool:
+    heads = ScriptDirectory.from_config(AlembicConfig(ALEMBIC_INI)).get_heads()
+    return set(MigrationContext.configure(connection).get_current_heads()) == set(heads)
+
+async def is_schema_ready() -> bool:
+    """True once the database is migrated to the Alembic head (checked once per process)."""
+    global _schema_ready
+    if not _schema_ready:
+        async with async_engine.connect() as conn:
+            _schema_ready = await conn.run_sync(_schema_at_head)
+    return _schema_ready
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
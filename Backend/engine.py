@@ -4,8 +4,39 @@ Implements exact mathematical logic from Master Specification.
 All formulas match the TRS document precisely.
 """
 from schemas import FullState, TargetType, GoalAnalysis, RetirementAnalysis, DashboardMetrics
+import math
 from datetime import date
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+from functools import cached_property, lru_cache
+from contextlib import contextmanager
+from queue import LifoQueue, Empty, Full
+import numpy as np
+
+try:
+    from engine_kernels_aot import insurance_cover  # precompiled by `python engine_kernels.py`
+except ImportError:
+    from engine_kernels import insurance_cover
+
+
+# Goal status buckets by share of monthly surplus needed: <=30%, <=60%, <=100%, above
+GOAL_SURPLUS_THRESHOLDS = np.array([0.3, 0.6, 1.0])
+GOAL_STATUS_LEVELS = np.array(["ON_TRACK", "NEEDS_ATTENTION", "AT_RISK", "CRITICAL"])
+GOAL_FEASIBILITY_LEVELS = np.array(["Highly Achievable", "Achievable with Focus", "Challenging", "Needs Revision"])
+
+CASHFLOW_TABLE_COLUMNS = ("year", "begin_value", "monthly_pension", "pension_paid_yearly", "end_value")
+
+
+@lru_cache(maxsize=256)
+def corpus_required(annual_expense: float, real_rate: float, pension_years: int) -> float:
+    """
+    Corpus needed at retirement: present value of pension_years annual payments
+    at the real rate. Pure, so repeat what-if runs with the same inputs hit the cache.
+    """
+    # Formula: Corpus = AnnualExpense * (1 - (1 + real_rate)^(-years)) / real_rate
+    # This is Present Value of Growing Annuity; expm1/log1p keep it accurate as real_rate -> 0
+    if real_rate == 0:
+        return annual_expense * pension_years
+    return annual_expense * -math.expm1(-pension_years * math.log1p(real_rate)) / real_rate
 
 
 class FinancialEngine:
@@ -15,7 +46,16 @@ class FinancialEngine:
     """
     
     def __init__(self, state: FullState):
+        # Aggregate helpers below are cached_property: the state is treated as
+        # read-only for the lifetime of an engine (linked EMI/SIP totals aside).
+        self.state = state
+
+    def reset(self, state: FullState) -> "FinancialEngine":
+        """Rebind the engine to a new state, dropping aggregates cached for the old one."""
+        for name in _CACHED_AGGREGATES:
+            self.__dict__.pop(name, None)
         self.state = state
+        return self
 
     def calculate(self) -> Dict[str, Any]:
         """
@@ -66,8 +106,8 @@ class FinancialEngine:
         2. Assets → Cash Flow: Sum of SIPs
         """
         # Rule 1: Liabilities -> linked_emis
-        total_emi = sum(l.emi for l in self.state.liabilities)
-        self.state.cash_flow.outflows.linked_emis = total_emi
+        emi, _ = self.liability_columns
+        self.state.cash_flow.outflows.linked_emis = float(emi.sum())
         
         # Rule 2: Assets.investments -> linked_investments
         total_sip = sum(inv.monthly_sip for inv in self.state.assets.investments)
@@ -99,10 +139,20 @@ class FinancialEngine:
             "months_to_retire": max(0, months_to_retire)
         }
 
-    def _get_monthly_expenses(self) -> float:
+    @cached_property
+    def liability_columns(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(emi, outstanding) of every liability as float64 columns, for vectorised totals."""
+        liabilities = self.state.liabilities
+        n = len(liabilities)
+        emi = np.fromiter((l.emi for l in liabilities), dtype=np.float64, count=n)
+        outstanding = np.fromiter((l.outstanding for l in liabilities), dtype=np.float64, count=n)
+        return emi, outstanding
+
+    @cached_property
+    def expense_breakdown(self) -> Tuple[float, float]:
         """
-        Get current monthly expenses (Essential + Lifestyle).
-        TRS Rule: Do NOT include EMIs or Investments in retirement expense baseline.
+        Current monthly (essential, lifestyle) expenses.
+        Detailed breakdowns, when present, replace the aggregate figures.
         """
         outflows = self.state.cash_flow.outflows
         
@@ -111,22 +161,22 @@ class FinancialEngine:
         lifestyle = outflows.lifestyle
         
         # Add detailed breakdowns if available
-        if outflows.essential_details:
-            details = outflows.essential_details
-            essential = (
-                details.house_rent + details.maintenance + details.property_tax +
-                details.utilities + details.groceries + details.transportation +
-                details.medical_expenses + details.children_school_fees +
-                details.insurance_premiums + details.other
-            )
-        
-        if outflows.lifestyle_details:
-            details = outflows.lifestyle_details
-            lifestyle = (
-                details.maid_expense + details.shopping + details.travel +
-                details.dining_entertainment + details.other
-            )
+        # Breakdowns are validated TypedDicts: only known keys, each a monthly amount, missing = 0
+        if outflows.essential_details is not None:
+            essential = sum(outflows.essential_details.values())
+        
+        if outflows.lifestyle_details is not None:
+            lifestyle = sum(outflows.lifestyle_details.values())
         
+        return essential, lifestyle
+
+    @cached_property
+    def monthly_expenses(self) -> float:
+        """
+        Get current monthly expenses (Essential + Lifestyle).
+        TRS Rule: Do NOT include EMIs or Investments in retirement expense baseline.
+        """
+        essential, lifestyle = self.expense_breakdown
         return essential + lifestyle
 
     def _calculate_retirement_corpus(self) -> Dict[str, Any]:
@@ -142,7 +192,7 @@ class FinancialEngine:
         primary = self.state.user_profile.primary
         
         # Current Monthly Expenses (Essential + Lifestyle only)
-        current_monthly_expense = self._get_monthly_expenses()
+        current_monthly_expense = self.monthly_expenses
         
         inflation = assumptions.inflation
         years_to_retire = metrics["years_to_retire"]
@@ -167,16 +217,7 @@ class FinancialEngine:
         # (which uses annual compounding in Approach A)
         annual_expense_at_retirement = expense_at_retirement * 12
         
-        # Formula: Corpus = AnnualExpense * (1 - (1 + real_rate)^(-years)) / real_rate
-        # This is Present Value of Growing Annuity
-        if real_rate == 0:
-            corpus_required = annual_expense_at_retirement * pension_years
-        else:
-            corpus_required = (
-                annual_expense_at_retirement * 
-                (1 - (1 + real_rate) ** (-pension_years)) / 
-                real_rate
-            )
+        corpus = corpus_required(annual_expense_at_retirement, real_rate, pension_years)
         
         # Money Required to Retire Now (present value of corpus)
         # Formula: PV = Corpus / (1 + ROI/12)^months
@@ -185,16 +226,16 @@ class FinancialEngine:
         months_to_retire = metrics["months_to_retire"]
         
         if months_to_retire > 0:
-            money_to_retire_now = corpus_required / ((1 + monthly_rate) ** months_to_retire)
+            money_to_retire_now = corpus / ((1 + monthly_rate) ** months_to_retire)
         else:
-            money_to_retire_now = corpus_required
+            money_to_retire_now = corpus
             
         return {
             "current_monthly_expenses": round(current_monthly_expense, 2),
             "expense_at_retirement_monthly": round(expense_at_retirement, 2),
             "real_rate_percent": round(real_rate * 100, 2),
             "pension_years": pension_years,
-            "corpus_required": round(corpus_required, 2),
+            "corpus_required": round(corpus, 2),
             "money_to_retire_now": round(money_to_retire_now, 2)
         }
 
@@ -211,30 +252,18 @@ class FinancialEngine:
         today = date.today()
         
         # Get monthly surplus available for goals
-        total_inflow = self._get_total_inflow()
+        total_inflow = self.total_inflow
         outflows = self.state.cash_flow.outflows
-        essential = outflows.essential
-        lifestyle = outflows.lifestyle
+        essential, lifestyle = self.expense_breakdown
         
-        if outflows.essential_details:
-            d = outflows.essential_details
-            essential = (d.house_rent + d.maintenance + d.property_tax + 
-                        d.utilities + d.groceries + d.transportation + 
-                        d.medical_expenses + d.children_school_fees + 
-                        d.insurance_premiums + d.other)
-        
-        if outflows.lifestyle_details:
-            d = outflows.lifestyle_details
-            lifestyle = (d.maid_expense + d.shopping + d.travel + 
-                        d.dining_entertainment + d.other)
-                        
         total_outflow = essential + lifestyle + outflows.linked_emis + outflows.linked_investments
         monthly_surplus = max(0, total_inflow - total_outflow)
         
-        # Calculate total SIP required for all goals
-        total_sip_for_goals = 0
+        # Per-goal horizons; costs and SIPs are then computed column-wise
+        goals = self.state.goals
+        goal_years = []
 
-        for goal in self.state.goals:
+        for goal in goals:
             # Calculate Years to Goal based on target_type
             years_to_goal = 0
             
@@ -260,51 +289,44 @@ class FinancialEngine:
                 except ValueError:
                     years_to_goal = 0
             
-            years_to_goal = max(0, years_to_goal)
-            months_to_goal = int(years_to_goal * 12)
-            
-            # Calculate Future Cost using inflation
-            # Formula: FV = CurrentCost * (1 + inflation)^years
-            future_cost = goal.current_cost * ((1 + inflation) ** years_to_goal)
-            
-            # ============================================
-            # NEW: GOAL ACHIEVABILITY ANALYSIS
-            # ============================================
-            
-            # Calculate Monthly SIP required to achieve goal
-            # Formula: PMT = FV * r / ((1+r)^n - 1) for ordinary annuity
-            monthly_rate = pre_retire_roi / 12
-            sip_required = 0
-            
-            if months_to_goal > 0 and monthly_rate > 0:
-                sip_required = (future_cost * monthly_rate) / (((1 + monthly_rate) ** months_to_goal) - 1)
-            elif months_to_goal > 0:
-                sip_required = future_cost / months_to_goal
-            else:
-                sip_required = future_cost  # Immediate goal
-            
-            total_sip_for_goals += sip_required
-            
-            # Determine goal status
-            if months_to_goal <= 0:
-                status = "PAST_DUE"
-                feasibility = "Critical"
-            elif sip_required <= 0:
-                status = "ACHIEVED"
-                feasibility = "Excellent"
-            elif sip_required <= monthly_surplus * 0.3:  # Can be achieved with < 30% of surplus
-                status = "ON_TRACK"
-                feasibility = "Highly Achievable"
-            elif sip_required <= monthly_surplus * 0.6:  # Needs 30-60% of surplus
-                status = "NEEDS_ATTENTION"
-                feasibility = "Achievable with Focus"
-            elif sip_required <= monthly_surplus:  # Needs most of surplus
-                status = "AT_RISK"
-                feasibility = "Challenging"
-            else:
-                status = "CRITICAL"
-                feasibility = "Needs Revision"
-            
+            goal_years.append(max(0, years_to_goal))
+        
+        years_arr = np.array(goal_years, dtype=np.float64)
+        months_arr = (years_arr * 12).astype(np.int64)
+        
+        # Calculate Future Cost using inflation
+        # Formula: FV = CurrentCost * (1 + inflation)^years
+        cost_arr = np.fromiter((g.current_cost for g in goals), dtype=np.float64, count=len(goals))
+        future_arr = cost_arr * ((1 + inflation) ** years_arr)
+        
+        # ============================================
+        # NEW: GOAL ACHIEVABILITY ANALYSIS
+        # ============================================
+        
+        # Calculate Monthly SIP required to achieve goal
+        # Formula: PMT = FV * r / ((1+r)^n - 1) for ordinary annuity
+        # Immediate goals (no months left) need the full future cost
+        monthly_rate = pre_retire_roi / 12
+        pending = months_arr > 0
+        sip_arr = future_arr.copy()
+        if monthly_rate > 0:
+            sip_arr[pending] = (future_arr[pending] * monthly_rate) / (((1 + monthly_rate) ** months_arr[pending]) - 1)
+        else:
+            sip_arr[pending] = future_arr[pending] / months_arr[pending]
+        
+        # Calculate total SIP required for all goals
+        total_sip_for_goals = float(sip_arr.sum())
+        
+        # Determine goal status: bucket SIP against surplus thresholds in one pass,
+        # then override immediate (PAST_DUE) and fully funded (ACHIEVED) goals
+        bucket = np.searchsorted(monthly_surplus * GOAL_SURPLUS_THRESHOLDS, sip_arr, side="left")
+        statuses = np.where(months_arr <= 0, "PAST_DUE",
+                            np.where(sip_arr <= 0, "ACHIEVED", GOAL_STATUS_LEVELS[bucket])).tolist()
+        feasibilities = np.where(months_arr <= 0, "Critical",
+                                 np.where(sip_arr <= 0, "Excellent", GOAL_FEASIBILITY_LEVELS[bucket])).tolist()
+        
+        for goal, years_to_goal, months_to_goal, future_cost, sip_required, status, feasibility in zip(
+                goals, goal_years, months_arr.tolist(), future_arr.tolist(), sip_arr.tolist(), statuses, feasibilities):
             # Calculate what percentage of surplus this goal needs
             surplus_allocation_percent = (sip_required / monthly_surplus * 100) if monthly_surplus > 0 else 100
             
@@ -357,7 +379,8 @@ class FinancialEngine:
         
         return None
 
-    def _get_total_inflow(self) -> float:
+    @cached_property
+    def total_inflow(self) -> float:
         """Calculate total monthly inflow from all sources."""
         inflows = self.state.cash_flow.inflows
         
@@ -369,7 +392,8 @@ class FinancialEngine:
             getattr(inflows, 'other', 0)
         )
 
-    def _get_total_assets(self) -> float:
+    @cached_property
+    def total_assets(self) -> float:
         """Calculate total asset value."""
         assets = self.state.assets
         
@@ -398,9 +422,11 @@ class FinancialEngine:
         
         return real_estate_value + bank_balance + investment_value + insurance_value + liquid_cash
 
-    def _get_total_liabilities(self) -> float:
+    @cached_property
+    def total_liabilities(self) -> float:
         """Calculate total liability value."""
-        return sum(l.outstanding for l in self.state.liabilities)
+        _, outstanding = self.liability_columns
+        return float(outstanding.sum())
 
     def _generate_dashboard_metrics(self, corpus_required: float) -> Dict[str, Any]:
         """
@@ -419,29 +445,15 @@ class FinancialEngine:
         assumptions = self.state.assumptions
         
         # === Total Inflow ===
-        total_inflow = self._get_total_inflow()
+        total_inflow = self.total_inflow
         
         # === Asset & Liability Totals ===
-        total_assets = self._get_total_assets()
-        total_liabilities = self._get_total_liabilities()
+        total_assets = self.total_assets
+        total_liabilities = self.total_liabilities
         net_worth = total_assets - total_liabilities
         
         # === Expense Categories ===
-        essential = outflows.essential
-        lifestyle = outflows.lifestyle
-        
-        # Add detailed if available
-        if outflows.essential_details:
-            d = outflows.essential_details
-            essential = (d.house_rent + d.maintenance + d.property_tax + 
-                        d.utilities + d.groceries + d.transportation + 
-                        d.medical_expenses + d.children_school_fees + 
-                        d.insurance_premiums + d.other)
-        
-        if outflows.lifestyle_details:
-            d = outflows.lifestyle_details
-            lifestyle = (d.maid_expense + d.shopping + d.travel + 
-                        d.dining_entertainment + d.other)
+        essential, lifestyle = self.expense_breakdown
         
         total_emi = outflows.linked_emis
         total_investments = outflows.linked_investments
@@ -538,30 +550,41 @@ class FinancialEngine:
         inflation = assumptions.inflation
         
         # Starting values
-        begin_value = retirement_data["corpus_required"]
+        corpus = retirement_data["corpus_required"]
         monthly_pension = retirement_data["expense_at_retirement_monthly"]
         
-        cashflow_table = []
-        
-        for age in range(retirement_age, pension_till_age + 1):
-            pension_yearly = monthly_pension * 12
-            
-            # End value using annual compounding (Approach A)
-            end_value = begin_value * (1 + corpus_return) - pension_yearly
-            
-            cashflow_table.append({
-                "year": age,
-                "begin_value": round(begin_value, 2),
-                "monthly_pension": round(monthly_pension, 2),
-                "pension_paid_yearly": round(pension_yearly, 2),
-                "end_value": round(max(0, end_value), 2)  # Prevent negative
-            })
-            
-            # Next year setup
-            begin_value = max(0, end_value)
-            monthly_pension = monthly_pension * (1 + inflation)  # Pension grows with inflation
-        
-        return cashflow_table
+        years = np.arange(retirement_age, pension_till_age + 1)
+        if years.size == 0:
+            return []
+        
+        # Monthly pension grows with inflation: accumulate the product column in one pass
+        growth = np.full(years.size, 1 + inflation, dtype=np.float64)
+        growth[0] = monthly_pension
+        monthly_pensions = np.multiply.accumulate(growth)
+        pensions_yearly = monthly_pensions * 12
+        
+        # End value using annual compounding (Approach A), solved in closed form:
+        # E_k = (1+r)^(k+1) * (corpus - sum_{j<=k} P_j / (1+r)^(j+1)).
+        # Once the balance goes negative it only falls further, so flooring the
+        # closed form at zero matches flooring year by year (prevent negative).
+        if 1 + corpus_return > 0:
+            compounding = np.power(1 + corpus_return, np.arange(1, years.size + 1, dtype=np.float64))
+            end_values = compounding * (corpus - np.cumsum(pensions_yearly / compounding))
+            np.maximum(end_values, 0.0, out=end_values)
+        else:
+            end_values = np.zeros(years.size, dtype=np.float64)
+        begin_values = np.empty(years.size, dtype=np.float64)
+        begin_values[0] = corpus
+        begin_values[1:] = end_values[:-1]
+        
+        columns = zip(
+            years.tolist(),
+            [round(v, 2) for v in begin_values.tolist()],
+            [round(v, 2) for v in monthly_pensions.tolist()],
+            [round(v, 2) for v in pensions_yearly.tolist()],
+            [round(v, 2) for v in end_values.tolist()],
+        )
+        return [dict(zip(CASHFLOW_TABLE_COLUMNS, row)) for row in columns]
 
     def _calculate_child_planning(self, child_inflation: float = None) -> List[Dict]:
         """
@@ -659,7 +682,7 @@ class FinancialEngine:
         Formula: Contingency Fund = Monthly Expenses × Number of Months
         Uses the same monthly expenses as retirement calculation (Essential + Lifestyle).
         """
-        monthly_expenses = self._get_monthly_expenses()
+        monthly_expenses = self.monthly_expenses
         
         return {
             "monthly_expenses": round(monthly_expenses, 2),
@@ -680,7 +703,8 @@ class FinancialEngine:
         primary = self.state.user_profile.primary
         inflows = self.state.cash_flow.inflows
         
-        insurance_results = []
+        # Earning members: (name, monthly_income, current_age, retirement_age, years_left)
+        earners = []
         
         # Primary user
         primary_dob = primary.dob
@@ -688,24 +712,8 @@ class FinancialEngine:
         retirement_age = primary.retirement_age if hasattr(primary, 'retirement_age') else primary.retire_age
         years_left = max(0, retirement_age - primary_age)
         
-        primary_monthly = inflows.primary_income
-        if primary_monthly > 0:
-            annual_income = primary_monthly * 12
-            
-            if growth > 0 and years_left > 0:
-                insurance_cover = annual_income * (((1 + growth) ** years_left - 1) / growth)
-            else:
-                insurance_cover = annual_income * years_left
-            
-            insurance_results.append({
-                "member_name": primary.name,
-                "monthly_income": round(primary_monthly, 2),
-                "current_age": round(primary_age, 2),
-                "retirement_age": retirement_age,
-                "expected_growth": round(growth * 100, 2),
-                "years_left": int(years_left),
-                "insurance_cover_required": round(insurance_cover, 2)
-            })
+        if inflows.primary_income > 0:
+            earners.append((primary.name, inflows.primary_income, primary_age, retirement_age, years_left))
         
         # Spouse (if working)
         if self.state.user_profile.spouse and inflows.spouse_income > 0:
@@ -714,23 +722,60 @@ class FinancialEngine:
             # Use spouse's own retirement age per Master Spec Section 10
             spouse_retirement_age = getattr(spouse, 'retirement_age', retirement_age) or retirement_age
             spouse_years_left = max(0, spouse_retirement_age - spouse_age)
-            
-            spouse_monthly = inflows.spouse_income
-            annual_income = spouse_monthly * 12
-            
-            if growth > 0 and spouse_years_left > 0:
-                insurance_cover = annual_income * (((1 + growth) ** spouse_years_left - 1) / growth)
-            else:
-                insurance_cover = annual_income * spouse_years_left
-            
-            insurance_results.append({
-                "member_name": spouse.name,
-                "monthly_income": round(spouse_monthly, 2),
-                "current_age": round(spouse_age, 2),
-                "retirement_age": spouse_retirement_age,
-                "expected_growth": round(growth * 100, 2),
-                "years_left": int(spouse_years_left),
-                "insurance_cover_required": round(insurance_cover, 2)
-            })
-        
-        return insurance_results
+            earners.append((spouse.name, inflows.spouse_income, spouse_age, spouse_retirement_age, spouse_years_left))
+        
+        if not earners:
+            return []
+        
+        monthly = np.fromiter((e[1] for e in earners), dtype=np.float64, count=len(earners))
+        ages = np.fromiter((e[2] for e in earners), dtype=np.float64, count=len(earners))
+        years = np.fromiter((e[4] for e in earners), dtype=np.float64, count=len(earners))
+        covers = insurance_cover(monthly, years, float(growth))
+        
+        # Round all money/age columns at once in integer paise; divide back only when emitting
+        cents = np.rint(np.stack((monthly, ages, covers)) * 100).astype(np.int64)
+        expected_growth = round(growth * 100, 2)
+        
+        return [
+            {
+                "member_name": name,
+                "monthly_income": monthly_cents / 100,
+                "current_age": age_cents / 100,
+                "retirement_age": member_retirement_age,
+                "expected_growth": expected_growth,
+                "years_left": int(member_years_left),
+                "insurance_cover_required": cover_cents / 100
+            }
+            for (name, _, _, member_retirement_age, member_years_left), monthly_cents, age_cents, cover_cents
+            in zip(earners, *cents.tolist())
+        ]
+
+
+_CACHED_AGGREGATES = tuple(
+    name for name, attr in vars(FinancialEngine).items() if isinstance(attr, cached_property)
+)
+
+
+class EnginePool:
+    """Thread-safe LIFO pool of reusable engines for the analysis endpoints."""
+
+    def __init__(self, size: int = 8):
+        self._engines = LifoQueue(maxsize=size)
+        for _ in range(size):
+            self._engines.put(FinancialEngine.__new__(FinancialEngine))
+
+    @contextmanager
+    def acquire(self, state: FullState):
+        """Yield a pooled engine bound to state; a fresh one is made if the pool is empty."""
+        try:
+            engine = self._engines.get_nowait()
+        except Empty:
+            engine = FinancialEngine.__new__(FinancialEngine)
+        try:
+            yield engine.reset(state)
+        finally:
+            engine.reset(None)  # don't keep the request's state alive while pooled
+            try:
+                self._engines.put_nowait(engine)
+            except Full:
+                pass
@@ -0,0 +1,48 @@
+"""
+Numeric Kernels for the Financial Engine
+Array kernels used by engine.py, compiled with Numba when it is installed.
+
+Build step (ahead-of-time, avoids the first-request JIT compile):
+    python engine_kernels.py   ->  engine_kernels_aot.*.so next to this file
+engine.py prefers the precompiled module and falls back to this one.
+"""
+import os
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; kernels fall back to plain NumPy
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+try:
+    from numba.pycc import CC
+except ImportError:  # pycc is absent without numba (and in newer numba releases)
+    CC = None
+
+
+def _insurance_cover(monthly, years_left, growth):
+    """Insurance cover per earner: annual income grown at `growth` over the years left."""
+    annual_income = monthly * 12.0
+    if growth <= 0:
+        return annual_income * years_left
+    # (1+g)^n - 1 == expm1(n * log1p(g)); years_left is fractional, so no integer table
+    factor = np.where(years_left > 0, np.expm1(years_left * np.log1p(growth)) / growth, years_left)
+    return annual_income * factor
+
+
+insurance_cover = njit(cache=True)(_insurance_cover)
+
+if CC is not None:
+    cc = CC("engine_kernels_aot")
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    # years_left is fractional, hence f8[:] rather than an integer array
+    cc.export("insurance_cover", "f8[:](f8[:], f8[:], f8)")(_insurance_cover)
+else:
+    cc = None
+
+
+if __name__ == "__main__":
+    if cc is None:
+        raise SystemExit("numba.pycc is not available; engine.py will use the JIT/NumPy kernels")
+    cc.compile()
@@ -3,6 +3,7 @@ Centralized Enum Definitions for the Financial Planner
 All enums used across schemas and models are defined here.
 """
 from enum import Enum
+from typing import Literal
 
 
 class RelationshipType(str, Enum):
@@ -38,6 +39,11 @@ class LiabilityType(str, Enum):
     OTHER = "Other"
 
 
+# Schema-side spelling of LiabilityType: pydantic checks a Literal with a set lookup
+# instead of building an enum member per row. Keep in sync with the enum (DB codes).
+LiabilityTypeName = Literal["Home", "Car", "Personal", "Other"]
+
+
 class AccountType(str, Enum):
     """Types of bank accounts"""
     SAVINGS = "Savings"
@@ -54,3 +60,7 @@ class PolicyType(str, Enum):
     WHOLE_LIFE = "Whole Life"
     HEALTH = "Health"
     OTHER = "Other"
+
+
+# Schema-side spelling of PolicyType (see LiabilityTypeName)
+PolicyTypeName = Literal["Term", "Endowment", "ULIP", "Whole Life", "Health", "Other"]
@@ -0,0 +1,34 @@
+"""
+Shared Outbound HTTP Client
+One keep-alive connection pool for all outbound API calls (OpenAI insights and calculator agents).
+Created at app startup and closed by the app lifespan.
+"""
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_ENABLED = True
+except ImportError:  # h2 is optional; without it the pool speaks HTTP/1.1
+    HTTP2_ENABLED = False
+
+_client: httpx.AsyncClient = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide async HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_ENABLED,
+            timeout=30,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its connection pool."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
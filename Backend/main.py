@@ -1,20 +1,43 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from database import engine, Base, get_db
+from fastapi.responses import StreamingResponse
+from responses import ORJSONResponse
+from typing import Dict, List, Optional, Tuple
+from contextlib import asynccontextmanager
+import os
+import asyncio
+import logging
+import logging.handlers
+import queue
+import functools
+import hashlib
+import multiprocessing
+import orjson
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db, is_schema_ready
 from schemas import (
     FullState, PrimaryUser, SpouseInfo, ContactDetails, UserProfile,
     FamilyMember, Goal, RealEstateAsset, BankAccount, InvestmentAsset,
-    InsurancePolicy, Liability, CashFlow, Assumptions, AnalysisResult
+    InsurancePolicy, Liability, CashFlow, Assumptions, AnalysisResult,
+    UserUpdate, FamilyMemberUpdate, GoalUpdate, RealEstateAssetUpdate, BankAccountUpdate,
+    InvestmentAssetUpdate, InsurancePolicyUpdate, LiabilityUpdate,
+    UserProfileResponse, SpouseOut, FamilyMembersResponse, GoalsResponse, RealEstateListResponse,
+    BankAccountsResponse, InvestmentsResponse, InsurancePoliciesResponse, LiabilitiesResponse,
+    AssumptionsOut, validate_fullstate
 )
-import models
 import crud
-from engine import FinancialEngine
+from engine import EnginePool
+from ai_service import generate_financial_insights, close_client as close_ai_client
+from http_client import get_http_client, close_http_client
+import monitoring
+from monitoring import observe, rate_limit, CALCULATOR_EXECUTION_SECONDS, GENERATION_SECONDS
+from cache import analysis_cache_key, get_cached, set_cached, get_tiered, set_tiered, invalidate
 import uvicorn
 
 # Calculator imports
-import calculator_models
 from calculator_schemas import (
     CalculatorDefinition, CalculatorExecutionRequest, CalculatorExecutionResult,
     CalculatorGenerationRequest, ConversationContinueRequest, CalculatorGenerationResponse,
@@ -22,19 +45,72 @@ from calculator_schemas import (
     ExplanationRequest, ExplanationResponse, CalculatorCategory, PreviewExecutionRequest
 )
 import calculator_crud
-from calculator_engine import CalculatorEngine, create_sample_calculators
+import calculation_log_writer
+from calculation_log_writer import enqueue_calculation_log
+from calculator_engine import CalculatorEngine, create_sample_calculators, execute_version
 from calculator_generator_service import (
-    orchestrator, run_explanation_agent, generate_result_explanation
+    orchestrator, run_explanation_agent, generate_result_explanation, stream_result_explanation,
+    close_client as close_generator_client
 )
 
-# Initialize Database tables
-models.Base.metadata.create_all(bind=engine)
-calculator_models.Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
+
+# Reused FinancialEngine instances for the analysis endpoints
+engine_pool = EnginePool()
+
+
+def _start_log_listener():
+    """Route log records through a queue so handlers never block request handling."""
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(queue_handler)
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    listener.start()
+    return queue_handler, listener
+
+
+# Uvicorn worker processes (each runs the lifespan) and calculator processes per worker;
+# together they should not oversubscribe the cores
+WEB_WORKERS = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+CALCULATOR_POOL_WORKERS = int(
+    os.getenv("CALCULATOR_POOL_WORKERS", max(1, (os.cpu_count() or 1) // WEB_WORKERS))
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    queue_handler, log_listener = _start_log_listener()
+    # Tables are managed by Alembic (`alembic upgrade head`); only verify the revision here
+    if not await is_schema_ready():
+        raise RuntimeError("Database schema is not at the latest migration; run `alembic upgrade head`")
+    # Generate (and cache) every model's JSON schema now instead of on the first /docs request
+    app.openapi()
+    # One keep-alive pool for all outbound LLM calls, opened before the first request
+    app.state.http_client = get_http_client()
+    # Calculator runs are CPU-bound: execute them in worker processes, off the event loop and GIL
+    app.state.calculator_pool = ProcessPoolExecutor(
+        max_workers=CALCULATOR_POOL_WORKERS, mp_context=multiprocessing.get_context("spawn")
+    )
+    calculation_log_writer.start()
+    yield
+    await calculation_log_writer.stop()
+    app.state.calculator_pool.shutdown()
+    # Release pooled outbound connections on shutdown
+    await close_ai_client()
+    await close_generator_client()
+    await close_http_client()
+    log_listener.stop()
+    logging.getLogger().removeHandler(queue_handler)
+
 
 app = FastAPI(
     title="AI Financial Planner API",
     description="Comprehensive financial planning API with AI-powered insights",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,  # orjson-encoded bodies for the large analysis payloads
+    lifespan=lifespan
 )
 
 # CORS setup for Frontend
@@ -46,6 +122,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-client limits on expensive endpoints (when slowapi is installed)
+monitoring.setup(app)
+
 # ============================================================================
 # ROOT
 # ============================================================================
@@ -59,19 +138,25 @@ def read_root():
     }
 
 
+@app.get("/metrics")
+def metrics():
+    """Prometheus metrics (latency histograms for P50/P95/P99)."""
+    return monitoring.metrics_response()
+
+
 # ============================================================================
 # USER PROFILE ENDPOINTS
 # ============================================================================
 
 @app.post("/api/users", status_code=201)
-def create_user_profile(
+async def create_user_profile(
     user_profile: UserProfile,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new user with complete profile."""
     try:
         # Create primary user
-        db_user = crud.create_user(
+        db_user = await crud.create_user(
             db,
             user_profile.primary,
             user_profile.contact_details,
@@ -80,15 +165,15 @@ def create_user_profile(
         
         # Create spouse if provided
         if user_profile.spouse:
-            crud.create_spouse(db, db_user.id, user_profile.spouse)
+            await crud.create_spouse(db, db_user.id, user_profile.spouse)
         
         # Create family members if provided
         for member in user_profile.family_members:
-            crud.create_family_member(db, db_user.id, member)
+            await crud.create_family_member(db, db_user.id, member)
         
         # Create default assumptions
         default_assumptions = Assumptions()
-        crud.create_or_update_assumptions(db, db_user.id, default_assumptions)
+        await crud.create_or_update_assumptions(db, db_user.id, default_assumptions)
         
         return {"user_id": db_user.id, "message": "User profile created successfully"}
     
@@ -96,34 +181,30 @@ def create_user_profile(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/users/{user_id}")
-def get_user_profile(user_id: str, db: Session = Depends(get_db)):
+@app.get("/api/users/{user_id}", response_model=UserProfileResponse, response_model_exclude_unset=True)
+async def get_user_profile(user_id: str, db: AsyncSession = Depends(get_db)):
     """Get complete user profile with all related data."""
-    db_user = crud.get_user(db, user_id)
+    # Single eager-loaded query for the user and all related data
+    db_user = await crud.get_user_full(db, user_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Get all related data
-    spouse = crud.get_spouse(db, user_id)
-    family_members = crud.get_family_members(db, user_id)
-    goals = crud.get_goals(db, user_id)
-    
     return {
         "user": db_user,
-        "spouse": spouse,
-        "family_members": family_members,
-        "goals": goals
+        "spouse": db_user.spouse,
+        "family_members": db_user.family_members,
+        "goals": db_user.goals
     }
 
 
 @app.put("/api/users/{user_id}")
-def update_user_profile(
+async def update_user_profile(
     user_id: str,
-    user_data: dict,
-    db: Session = Depends(get_db)
+    user_data: UserUpdate,
+    db: AsyncSession = Depends(get_db)
 ):
     """Update user profile."""
-    db_user = crud.update_user(db, user_id, user_data)
+    db_user = await crud.update_user(db, user_id, user_data.model_dump(exclude_unset=True))
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -131,9 +212,9 @@ def update_user_profile(
 
 
 @app.delete("/api/users/{user_id}")
-def delete_user_profile(user_id: str, db: Session = Depends(get_db)):
+async def delete_user_profile(user_id: str, db: AsyncSession = Depends(get_db)):
     """Delete user and all related data."""
-    success = crud.delete_user(db, user_id)
+    success = await crud.delete_user(db, user_id)
     if not success:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -145,42 +226,42 @@ def delete_user_profile(user_id: str, db: Session = Depends(get_db)):
 # ============================================================================
 
 @app.post("/api/users/{user_id}/spouse", status_code=201)
-def create_or_update_spouse(
+async def create_or_update_spouse(
     user_id: str,
     spouse_data: SpouseInfo,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create or update spouse information."""
     # Check if user exists
-    user = crud.get_user(db, user_id)
+    user = await crud.get_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Check if spouse already exists
-    existing_spouse = crud.get_spouse(db, user_id)
+    existing_spouse = await crud.get_spouse(db, user_id)
     if existing_spouse:
         # Update
-        updated_spouse = crud.update_spouse(db, user_id, spouse_data.dict())
+        updated_spouse = await crud.update_spouse(db, user_id, spouse_data.model_dump(exclude_unset=True))
         return {"message": "Spouse updated successfully", "spouse": updated_spouse}
     else:
         # Create
-        new_spouse = crud.create_spouse(db, user_id, spouse_data)
+        new_spouse = await crud.create_spouse(db, user_id, spouse_data)
         return {"message": "Spouse created successfully", "spouse": new_spouse}
 
 
-@app.get("/api/users/{user_id}/spouse")
-def get_spouse_info(user_id: str, db: Session = Depends(get_db)):
+@app.get("/api/users/{user_id}/spouse", response_model=SpouseOut, response_model_exclude_unset=True)
+async def get_spouse_info(user_id: str, db: AsyncSession = Depends(get_db)):
     """Get spouse information."""
-    spouse = crud.get_spouse(db, user_id)
+    spouse = await crud.get_spouse(db, user_id)
     if not spouse:
         raise HTTPException(status_code=404, detail="Spouse not found")
     return spouse
 
 
 @app.delete("/api/users/{user_id}/spouse")
-def delete_spouse_info(user_id: str, db: Session = Depends(get_db)):
+async def delete_spouse_info(user_id: str, db: AsyncSession = Depends(get_db)):
     """Delete spouse information."""
-    success = crud.delete_spouse(db, user_id)
+    success = await crud.delete_spouse(db, user_id)
     if not success:
         raise HTTPException(status_code=404, detail="Spouse not found")
     return {"message": "Spouse deleted successfully"}
@@ -191,45 +272,45 @@ def delete_spouse_info(user_id: str, db: Session = Depends(get_db)):
 # ============================================================================
 
 @app.post("/api/users/{user_id}/family-members", status_code=201)
-def add_family_member(
+async def add_family_member(
     user_id: str,
     member_data: FamilyMember,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Add a family member."""
     # Check if user exists
-    user = crud.get_user(db, user_id)
+    user = await crud.get_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    new_member = crud.create_family_member(db, user_id, member_data)
+    new_member = await crud.create_family_member(db, user_id, member_data)
     return {"message": "Family member added successfully", "member": new_member}
 
 
-@app.get("/api/users/{user_id}/family-members")
-def get_all_family_members(user_id: str, db: Session = Depends(get_db)):
+@app.get("/api/users/{user_id}/family-members", response_model=FamilyMembersResponse, response_model_exclude_unset=True)
+async def get_all_family_members(user_id: str, db: AsyncSession = Depends(get_db)):
     """Get all family members."""
-    members = crud.get_family_members(db, user_id)
+    members = await crud.get_family_members(db, user_id)
     return {"family_members": members, "count": len(members)}
 
 
 @app.put("/api/users/{user_id}/family-members/{member_id}")
-def update_family_member_info(
+async def update_family_member_info(
     member_id: str,
-    member_data: dict,
-    db: Session = Depends(get_db)
+    member_data: FamilyMemberUpdate,
+    db: AsyncSession = Depends(get_db)
 ):
     """Update family member information."""
-    updated_member = crud.update_family_member(db, member_id, member_data)
+    updated_member = await crud.update_family_member(db, member_id, member_data.model_dump(exclude_unset=True))
     if not updated_member:
         raise HTTPException(status_code=404, detail="Family member not found")
     return {"message": "Family member updated successfully", "member": updated_member}
 
 
 @app.delete("/api/users/{user_id}/family-members/{member_id}")
-def remove_family_member(member_id: str, db: Session = Depends(get_db)):
+async def remove_family_member(member_id: str, db: AsyncSession = Depends(get_db)):
     """Delete a family member."""
-    success = crud.delete_family_member(db, member_id)
+    success = await crud.delete_family_member(db, member_id)
     if not success:
         raise HTTPException(status_code=404, detail="Family member not found")
     return {"message": "Family member deleted successfully"}
@@ -240,36 +321,36 @@ def remove_family_member(member_id: str, db: Session = Depends(get_db)):
 # ============================================================================
 
 @app.post("/api/users/{user_id}/goals", status_code=201)
-def add_goal(user_id: str, goal_data: Goal, db: Session = Depends(get_db)):
+async def add_goal(user_id: str, goal_data: Goal, db: AsyncSession = Depends(get_db)):
     """Add a financial goal."""
-    user = crud.get_user(db, user_id)
+    user = await crud.get_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    new_goal = crud.create_goal(db, user_id, goal_data)
+    new_goal = await crud.create_goal(db, user_id, goal_data)
     return {"message": "Goal added successfully", "goal": new_goal}
 
 
-@app.get("/api/users/{user_id}/goals")
-def get_all_goals(user_id: str, db: Session = Depends(get_db)):
+@app.get("/api/users/{user_id}/goals", response_model=GoalsResponse, response_model_exclude_unset=True)
+async def get_all_goals(user_id: str, db: AsyncSession = Depends(get_db)):
     """Get all goals for a user."""
-    goals = crud.get_goals(db, user_id)
+    goals = await crud.get_goals(db, user_id)
     return {"goals": goals, "count": len(goals)}
 
 
 @app.put("/api/users/{user_id}/goals/{goal_id}")
-def update_goal_info(goal_id: str, goal_data: dict, db: Session = Depends(get_db)):
+async def update_goal_info(goal_id: str, goal_data: GoalUpdate, db: AsyncSession = Depends(get_db)):
     """Update a goal."""
-    updated_goal = crud.update_goal(db, goal_id, goal_data)
+    updated_goal = await crud.update_goal(db, goal_id, goal_data.model_dump(exclude_unset=True))
     if not updated_goal:
         raise HTTPException(status_code=404, detail="Goal not found")
     return {"message": "Goal updated successfully", "goal": updated_goal}
 
 
 @app.delete("/api/users/{user_id}/goals/{goal_id}")
-def remove_goal(goal_id: str, db: Session = Depends(get_db)):
+async def remove_goal(goal_id: str, db: AsyncSession = Depends(get_db)):
     """Delete a goal."""
-    success = crud.delete_goal(db, goal_id)
+    success = await crud.delete_goal(db, goal_id)
     if not success:
         raise HTTPException(status_code=404, detail="Goal not found")
     return {"message": "Goal deleted successfully"}
@@ -280,36 +361,36 @@ def remove_goal(goal_id: str, db: Session = Depends(get_db)):
 # ============================================================================
 
 @app.post("/api/users/{user_id}/assets/real-estate", status_code=201)
-def add_real_estate(user_id: str, asset_data: RealEstateAsset, db: Session = Depends(get_db)):
+async def add_real_estate(user_id: str, asset_data: RealEstateAsset, db: AsyncSession = Depends(get_db)):
     """Add a real estate asset."""
-    user = crud.get_user(db, user_id)
+    user = await crud.get_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    new_asset = crud.create_real_estate(db, user_id, asset_data)
+    new_asset = await crud.create_real_estate(db, user_id, asset_data)
     return {"message": "Real estate asset added successfully", "asset": new_asset}
 
 
-@app.get("/api/users/{user_id}/assets/real-estate")
-def get_all_real_estate(user_id: str, db: Session = Depends(get_db)):
+@app.get("/api/users/{user_id}/assets/real-estate", response_model=RealEstateListResponse, response_model_exclude_unset=True)
+async def get_all_real_estate(user_id: str, db: AsyncSession = Depends(get_db)):
     """Get all real estate assets."""
-    assets = crud.get_real_estate_assets(db, user_id)
+    assets = await crud.get_real_estate_assets(db, user_id)
     return {"real_estate": assets, "count": len(assets)}
 
 
 @app.put("/api/users/{user_id}/assets/real-estate/{asset_id}")
-def update_real_estate_info(asset_id: str, asset_data: dict, db: Session = Depends(get_db)):
+async def update_real_estate_info(asset_id: str, asset_data: RealEstateAssetUpdate, db: AsyncSession = Depends(get_db)):
     """Update real estate asset."""
-    updated_asset = crud.update_real_estate(db, asset_id, asset_data)
+    updated_asset = await crud.update_real_estate(db, asset_id, asset_data.model_dump(exclude_unset=True))
     if not updated_asset:
         raise HTTPException(status_code=404, detail="Real estate asset not found")
     return {"message": "Real estate updated successfully", "asset": updated_asset}
 
 
 @app.delete("/api/users/{user_id}/assets/real-estate/{asset_id}")
-def remove_real_estate(asset_id: str, db: Session = Depends(get_db)):
+async def remove_real_estate(asset_id: str, db: AsyncSession = Depends(get_db)):
     """Delete real estate asset."""
-    success = crud.delete_real_estate(db, asset_id)
+    success = await crud.delete_real_estate(db, asset_id)
     if not success:
         raise HTTPException(status_code=404, detail="Real estate asset not found")
     return {"message": "Real estate deleted successfully"}
@@ -320,36 +401,36 @@ def remove_real_estate(asset_id: str, db: Session = Depends(get_db)):
 # ============================================================================
 
 @app.post("/api/users/{user_id}/assets/bank-accounts", status_code=201)
-def add_bank_account(user_id: str, account_data: BankAccount, db: Session = Depends(get_db)):
+async def add_bank_account(user_id: str, account_data: BankAccount, db: AsyncSession = Depends(get_db)):
     """Add a bank account."""
-    user = crud.get_user(db, user_id)
+    user = await crud.get_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    new_account = crud.create_bank_account(db, user_id, account_data)
+    new_account = await crud.create_bank_account(db, user_id, account_data)
     return {"message": "Bank account added successfully", "account": new_account}
 
 
-@app.get("/api/users/{user_id}/assets/bank-accounts")
-def get_all_bank_accounts(user_id: str, db: Session = Depends(get_db)):
+@app.get("/api/users/{user_id}/assets/bank-accounts", response_model=BankAccountsResponse, response_model_exclude_unset=True)
+async def get_all_bank_accounts(user_id: str, db: AsyncSession = Depends(get_db)):
     """Get all bank accounts."""
-    accounts = crud.get_bank_accounts(db, user_id)
+    accounts = await crud.get_bank_accounts(db, user_id)
     return {"bank_accounts": accounts, "count": len(accounts)}
 
 
 @app.put("/api/users/{user_id}/assets/bank-accounts/{account_id}")
-def update_bank_account_info(account_id: str, account_data: dict, db: Session = Depends(get_db)):
+async def update_bank_account_info(account_id: str, account_data: BankAccountUpdate, db: AsyncSession = Depends(get_db)):
     """Update bank account."""
-    updated_account = crud.update_bank_account(db, account_id, account_data)
+    updated_account = await crud.update_bank_account(db, account_id, account_data.model_dump(exclude_unset=True))
     if not updated_account:
         raise HTTPException(status_code=404, detail="Bank account not found")
     return {"message": "Bank account updated successfully", "account": updated_account}
 
 
 @app.delete("/api/users/{user_id}/assets/bank-accounts/{account_id}")
-def remove_bank_account(account_id: str, db: Session = Depends(get_db)):
+async def remove_bank_account(account_id: str, db: AsyncSession = Depends(get_db)):
     """Delete bank account."""
-    success = crud.delete_bank_account(db, account_id)
+    success = await crud.delete_bank_account(db, account_id)
     if not success:
         raise HTTPException(status_code=404, detail="Bank account not found")
     return {"message": "Bank account deleted successfully"}
@@ -360,36 +441,36 @@ def remove_bank_account(account_id: str, db: Session = Depends(get_db)):
 # ============================================================================
 
 @app.post("/api/users/{user_id}/assets/investments", status_code=201)
-def add_investment(user_id: str, investment_data: InvestmentAsset, db: Session = Depends(get_db)):
+async def add_investment(user_id: str, investment_data: InvestmentAsset, db: AsyncSession = Depends(get_db)):
     """Add an investment."""
-    user = crud.get_user(db, user_id)
+    user = await crud.get_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    new_investment = crud.create_investment(db, user_id, investment_data)
+    new_investment = await crud.create_investment(db, user_id, investment_data)
     return {"message": "Investment added successfully", "investment": new_investment}
 
 
-@app.get("/api/users/{user_id}/assets/investments")
-def get_all_investments(user_id: str, db: Session = Depends(get_db)):
+@app.get("/api/users/{user_id}/assets/investments", response_model=InvestmentsResponse, response_model_exclude_unset=True)
+async def get_all_investments(user_id: str, db: AsyncSession = Depends(get_db)):
     """Get all investments."""
-    investments = crud.get_investments(db, user_id)
+    investments = await crud.get_investments(db, user_id)
     return {"investments": investments, "count": len(investments)}
 
 
 @app.put("/api/users/{user_id}/assets/investments/{investment_id}")
-def update_investment_info(investment_id: str, investment_data: dict, db: Session = Depends(get_db)):
+async def update_investment_info(investment_id: str, investment_data: InvestmentAssetUpdate, db: AsyncSession = Depends(get_db)):
     """Update investment."""
-    updated_investment = crud.update_investment(db, investment_id, investment_data)
+    updated_investment = await crud.update_investment(db, investment_id, investment_data.model_dump(exclude_unset=True))
     if not updated_investment:
         raise HTTPException(status_code=404, detail="Investment not found")
     return {"message": "Investment updated successfully", "investment": updated_investment}
 
 
 @app.delete("/api/users/{user_id}/assets/investments/{investment_id}")
-def remove_investment(investment_id: str, db: Session = Depends(get_db)):
+async def remove_investment(investment_id: str, db: AsyncSession = Depends(get_db)):
     """Delete investment."""
-    success = crud.delete_investment(db, investment_id)
+    success = await crud.delete_investment(db, investment_id)
     if not success:
         raise HTTPException(status_code=404, detail="Investment not found")
     return {"message": "Investment deleted successfully"}
@@ -400,36 +481,36 @@ def remove_investment(investment_id: str, db: Session = Depends(get_db)):
 # ============================================================================
 
 @app.post("/api/users/{user_id}/assets/insurance", status_code=201)
-def add_insurance_policy(user_id: str, policy_data: InsurancePolicy, db: Session = Depends(get_db)):
+async def add_insurance_policy(user_id: str, policy_data: InsurancePolicy, db: AsyncSession = Depends(get_db)):
     """Add an insurance policy."""
-    user = crud.get_user(db, user_id)
+    user = await crud.get_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    new_policy = crud.create_insurance(db, user_id, policy_data)
+    new_policy = await crud.create_insurance(db, user_id, policy_data)
     return {"message": "Insurance policy added successfully", "policy": new_policy}
 
 
-@app.get("/api/users/{user_id}/assets/insurance")
-def get_all_insurance_policies(user_id: str, db: Session = Depends(get_db)):
+@app.get("/api/users/{user_id}/assets/insurance", response_model=InsurancePoliciesResponse, response_model_exclude_unset=True)
+async def get_all_insurance_policies(user_id: str, db: AsyncSession = Depends(get_db)):
     """Get all insurance policies."""
-    policies = crud.get_insurance_policies(db, user_id)
+    policies = await crud.get_insurance_policies(db, user_id)
     return {"insurance_policies": policies, "count": len(policies)}
 
 
 @app.put("/api/users/{user_id}/assets/insurance/{policy_id}")
-def update_insurance_policy_info(policy_id: str, policy_data: dict, db: Session = Depends(get_db)):
+async def update_insurance_policy_info(policy_id: str, policy_data: InsurancePolicyUpdate, db: AsyncSession = Depends(get_db)):
     """Update insurance policy."""
-    updated_policy = crud.update_insurance(db, policy_id, policy_data)
+    updated_policy = await crud.update_insurance(db, policy_id, policy_data.model_dump(exclude_unset=True))
     if not updated_policy:
         raise HTTPException(status_code=404, detail="Insurance policy not found")
     return {"message": "Insurance policy updated successfully", "policy": updated_policy}
 
 
 @app.delete("/api/users/{user_id}/assets/insurance/{policy_id}")
-def remove_insurance_policy(policy_id: str, db: Session = Depends(get_db)):
+async def remove_insurance_policy(policy_id: str, db: AsyncSession = Depends(get_db)):
     """Delete insurance policy."""
-    success = crud.delete_insurance(db, policy_id)
+    success = await crud.delete_insurance(db, policy_id)
     if not success:
         raise HTTPException(status_code=404, detail="Insurance policy not found")
     return {"message": "Insurance policy deleted successfully"}
@@ -440,36 +521,36 @@ def remove_insurance_policy(policy_id: str, db: Session = Depends(get_db)):
 # ============================================================================
 
 @app.post("/api/users/{user_id}/liabilities", status_code=201)
-def add_liability(user_id: str, liability_data: Liability, db: Session = Depends(get_db)):
+async def add_liability(user_id: str, liability_data: Liability, db: AsyncSession = Depends(get_db)):
     """Add a liability."""
-    user = crud.get_user(db, user_id)
+    user = await crud.get_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    new_liability = crud.create_liability(db, user_id, liability_data)
+    new_liability = await crud.create_liability(db, user_id, liability_data)
     return {"message": "Liability added successfully", "liability": new_liability}
 
 
-@app.get("/api/users/{user_id}/liabilities")
-def get_all_liabilities(user_id: str, db: Session = Depends(get_db)):
+@app.get("/api/users/{user_id}/liabilities", response_model=LiabilitiesResponse, response_model_exclude_unset=True)
+async def get_all_liabilities(user_id: str, db: AsyncSession = Depends(get_db)):
     """Get all liabilities."""
-    liabilities = crud.get_liabilities(db, user_id)
+    liabilities = await crud.get_liabilities(db, user_id)
     return {"liabilities": liabilities, "count": len(liabilities)}
 
 
 @app.put("/api/users/{user_id}/liabilities/{liability_id}")
-def update_liability_info(liability_id: str, liability_data: dict, db: Session = Depends(get_db)):
+async def update_liability_info(liability_id: str, liability_data: LiabilityUpdate, db: AsyncSession = Depends(get_db)):
     """Update liability."""
-    updated_liability = crud.update_liability(db, liability_id, liability_data)
+    updated_liability = await crud.update_liability(db, liability_id, liability_data.model_dump(exclude_unset=True))
     if not updated_liability:
         raise HTTPException(status_code=404, detail="Liability not found")
     return {"message": "Liability updated successfully", "liability": updated_liability}
 
 
 @app.delete("/api/users/{user_id}/liabilities/{liability_id}")
-def remove_liability(liability_id: str, db: Session = Depends(get_db)):
+async def remove_liability(liability_id: str, db: AsyncSession = Depends(get_db)):
     """Delete liability."""
-    success = crud.delete_liability(db, liability_id)
+    success = await crud.delete_liability(db, liability_id)
     if not success:
         raise HTTPException(status_code=404, detail="Liability not found")
     return {"message": "Liability deleted successfully"}
@@ -480,20 +561,20 @@ def remove_liability(liability_id: str, db: Session = Depends(get_db)):
 # ============================================================================
 
 @app.put("/api/users/{user_id}/cash-flow")
-def update_cash_flow_data(user_id: str, cash_flow_data: CashFlow, db: Session = Depends(get_db)):
+async def update_cash_flow_data(user_id: str, cash_flow_data: CashFlow, db: AsyncSession = Depends(get_db)):
     """Create or update cash flow."""
-    user = crud.get_user(db, user_id)
+    user = await crud.get_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    cash_flow = crud.create_or_update_cash_flow(db, user_id, cash_flow_data)
+    cash_flow = await crud.create_or_update_cash_flow(db, user_id, cash_flow_data)
     return {"message": "Cash flow updated successfully", "cash_flow": cash_flow}
 
 
 @app.get("/api/users/{user_id}/cash-flow")
-def get_cash_flow_data(user_id: str, db: Session = Depends(get_db)):
+async def get_cash_flow_data(user_id: str, db: AsyncSession = Depends(get_db)):
     """Get cash flow."""
-    cash_flow = crud.get_cash_flow(db, user_id)
+    cash_flow = await crud.get_cash_flow(db, user_id)
     if not cash_flow:
         raise HTTPException(status_code=404, detail="Cash flow not found")
     return cash_flow
@@ -503,24 +584,28 @@ def get_cash_flow_data(user_id: str, db: Session = Depends(get_db)):
 # ASSUMPTIONS ENDPOINTS
 # ============================================================================
 
+# Returned (by reference) when a user has no stored assumptions; never mutate
+_DEFAULT_ASSUMPTIONS = {"inflation": 0.06, "pre_retire_roi": 0.12, "post_retire_roi": 0.08}
+
+
 @app.put("/api/users/{user_id}/assumptions")
-def update_assumptions_data(user_id: str, assumptions_data: Assumptions, db: Session = Depends(get_db)):
+async def update_assumptions_data(user_id: str, assumptions_data: Assumptions, db: AsyncSession = Depends(get_db)):
     """Create or update assumptions."""
-    user = crud.get_user(db, user_id)
+    user = await crud.get_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    assumptions = crud.create_or_update_assumptions(db, user_id, assumptions_data)
+    assumptions = await crud.create_or_update_assumptions(db, user_id, assumptions_data)
     return {"message": "Assumptions updated successfully", "assumptions": assumptions}
 
 
-@app.get("/api/users/{user_id}/assumptions")
-def get_assumptions_data(user_id: str, db: Session = Depends(get_db)):
+@app.get("/api/users/{user_id}/assumptions", response_model=AssumptionsOut, response_model_exclude_unset=True)
+async def get_assumptions_data(user_id: str, db: AsyncSession = Depends(get_db)):
     """Get assumptions."""
-    assumptions = crud.get_assumptions(db, user_id)
+    assumptions = await crud.get_assumptions(db, user_id)
     if not assumptions:
         # Return defaults
-        return {"inflation": 0.06, "pre_retire_roi": 0.12, "post_retire_roi": 0.08}
+        return _DEFAULT_ASSUMPTIONS
     return assumptions
 
 
@@ -528,23 +613,19 @@ def get_assumptions_data(user_id: str, db: Session = Depends(get_db)):
 # ANALYSIS ENDPOINTS
 # ============================================================================
 
-from ai_service import generate_financial_insights
-
 @app.post("/api/analyze")
-def analyze_financial_state(state: FullState):
+async def analyze_financial_state(state: FullState):
     """
     Core Endpoint: Receives Full User State -> Returns Financial Plan & Insights
     Uses OpenAI for comprehensive AI-powered analysis.
     """
     try:
-        # 1. Initialize Engine
-        engine_instance = FinancialEngine(state)
-        
-        # 2. Run Calculations
-        results = engine_instance.calculate()
+        # 1-2. Run Calculations on a pooled engine
+        with engine_pool.acquire(state) as engine_instance:
+            results = engine_instance.calculate()
         
         # 3. Generate AI Insights using OpenAI
-        ai_response = generate_financial_insights(results)
+        ai_response = await generate_financial_insights(results)
         
         if ai_response.get("success"):
             results["ai_analysis"] = ai_response["insights"]
@@ -559,31 +640,50 @@ def analyze_financial_state(state: FullState):
                 ]
             }
         
-        return results
+        # Engine output is plain data: encode it directly, skipping jsonable_encoder's walk
+        return ORJSONResponse(results)
         
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Financial analysis failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/users/{user_id}/analysis")
-def get_user_analysis(user_id: str, db: Session = Depends(get_db)):
+async def get_user_analysis(user_id: str, db: AsyncSession = Depends(get_db)):
     """
     Get comprehensive analysis for a user based on stored data.
     Constructs FullState from database and runs analysis.
     """
     try:
-        # Get all user data
-        db_user = crud.get_user(db, user_id)
+        # Serve from cache while the user's data is unchanged
+        db_user = await crud.get_user(db, user_id)
         if not db_user:
             raise HTTPException(status_code=404, detail="User not found")
         
+        cache_key = analysis_cache_key(user_id, db_user.updated_at)
+        cached = await get_cached(cache_key)
+        if cached is not None:
+            return ORJSONResponse(cached)
+        
+        # Get all user data (user graph eager-loaded in one call)
+        db_user = await crud.get_user_full(db, user_id)
+        
+        db_spouse = db_user.spouse
+        family_members = db_user.family_members
+        goals = db_user.goals
+        real_estate = db_user.real_estate_assets
+        bank_accounts = db_user.bank_accounts
+        investments = db_user.investment_assets
+        insurance_policies = db_user.insurance_policies
+        liabilities = db_user.liabilities
+        cash_flow = db_user.cash_flow
+        assumptions = db_user.assumptions
+        
         # Construct FullState from database
         # This is a simplified version - you may need to expand this
         # to properly convert database models to Pydantic schemas
         
-        from schemas import FullState, UserProfile, PrimaryUser, SpouseInfo, Assets
+        from schemas import UserProfile, PrimaryUser, SpouseInfo, Assets
         
         # Build user profile
         primary = PrimaryUser(
@@ -595,7 +695,6 @@ def get_user_analysis(user_id: str, db: Session = Depends(get_db)):
         
         # Get spouse
         spouse_data = None
-        db_spouse = crud.get_spouse(db, user_id)
         if db_spouse:
             spouse_data = SpouseInfo(
                 name=db_spouse.name,
@@ -603,9 +702,6 @@ def get_user_analysis(user_id: str, db: Session = Depends(get_db)):
                 working_status=db_spouse.working_status
             )
         
-        # Get family members
-        family_members = crud.get_family_members(db, user_id)
-        
         # Build profile
         user_profile = UserProfile(
             primary=primary,
@@ -614,15 +710,6 @@ def get_user_analysis(user_id: str, db: Session = Depends(get_db)):
             address=db_user.address
         )
         
-        # Get goals
-        goals = crud.get_goals(db, user_id)
-        
-        # Get assets
-        real_estate = crud.get_real_estate_assets(db, user_id)
-        bank_accounts = crud.get_bank_accounts(db, user_id)
-        investments = crud.get_investments(db, user_id)
-        insurance_policies = crud.get_insurance_policies(db, user_id)
-        
         assets = Assets(
             real_estate=real_estate,
             bank_accounts=bank_accounts,
@@ -630,32 +717,25 @@ def get_user_analysis(user_id: str, db: Session = Depends(get_db)):
             insurance_policies=insurance_policies
         )
         
-        # Get liabilities
-        liabilities = crud.get_liabilities(db, user_id)
-        
-        # Get cash flow
-        cash_flow = crud.get_cash_flow(db, user_id)
         if not cash_flow:
             raise HTTPException(status_code=404, detail="Cash flow data not found")
         
-        # Get assumptions
-        assumptions = crud.get_assumptions(db, user_id)
         if not assumptions:
             assumptions = Assumptions()
         
         # Build FullState
-        full_state = FullState(
-            user_profile=user_profile,
-            goals=goals,
-            assets=assets,
-            liabilities=liabilities,
-            cash_flow=cash_flow,
-            assumptions=assumptions
-        )
+        full_state = validate_fullstate({
+            "user_profile": user_profile,
+            "goals": goals,
+            "assets": assets,
+            "liabilities": liabilities,
+            "cash_flow": cash_flow,
+            "assumptions": assumptions
+        })
         
         # Run analysis
-        engine_instance = FinancialEngine(full_state)
-        results = engine_instance.calculate()
+        with engine_pool.acquire(full_state) as engine_instance:
+            results = engine_instance.calculate()
         
         # Add AI analysis (mocked)
         results["ai_analysis"] = {
@@ -667,11 +747,11 @@ def get_user_analysis(user_id: str, db: Session = Depends(get_db)):
             ]
         }
         
-        return results
+        await set_cached(cache_key, results)
+        return ORJSONResponse(results)
         
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Analysis failed for user %s", user_id)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -679,33 +759,66 @@ def get_user_analysis(user_id: str, db: Session = Depends(get_db)):
 # CALCULATOR GENERATION ENDPOINTS (Admin/AI-Assisted)
 # ============================================================================
 
+# Calculator read caches (in-process + Redis); every calculator write invalidates them
+CALCULATOR_LIST_CACHE_PREFIX = "calculators:list:"
+CALCULATOR_CACHE_CONTROL = "public, max-age=30"
+
+
+def _calculator_cache_keys(calculator_id: str):
+    # Entries are {"etag", "body"} (see _etag_entry)
+    return f"calculator:{calculator_id}:detail", f"calculator:{calculator_id}:history"
+
+
+def _etag_entry(body: dict) -> dict:
+    """Pair a response body with a weak ETag over its JSON; cached together so hits skip hashing."""
+    digest = hashlib.blake2b(orjson.dumps(body), digest_size=16).hexdigest()
+    return {"etag": f'W/"{digest}"', "body": body}
+
+
+def _conditional_response(request: Request, response: Response, entry: dict):
+    """Return 304 when the client already holds this ETag, else the body (with the ETag set)."""
+    etag = entry["etag"]
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CALCULATOR_CACHE_CONTROL})
+    response.headers["ETag"] = etag
+    return entry["body"]
+
+
+async def _invalidate_calculator_cache(calculator_id: Optional[str] = None):
+    """Drop cached reads for one calculator (if given) and all cached listings."""
+    keys = _calculator_cache_keys(calculator_id) if calculator_id else ()
+    await invalidate(*keys, prefix=CALCULATOR_LIST_CACHE_PREFIX)
+
+
 @app.post("/api/calculators/generate/start", response_model=CalculatorGenerationResponse)
-def start_calculator_generation(request: CalculatorGenerationRequest):
+@rate_limit(monitoring.GENERATION_RATE_LIMIT)
+async def start_calculator_generation(request: Request, generation: CalculatorGenerationRequest):
     """
     Start AI-driven conversational calculator generation.
     The AI will ask clarifying questions before generating a calculator.
     """
     try:
-        response = orchestrator.start_generation(
-            description=request.description,
-            category=request.category.value if request.category else None,
-            jurisdiction=request.jurisdiction
-        )
+        with observe(GENERATION_SECONDS, "start"):
+            response = await orchestrator.start_generation(
+                description=generation.description,
+                category=generation.category.value if generation.category else None,
+                jurisdiction=generation.jurisdiction
+            )
         return response
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Calculator generation failed to start")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/api/calculators/generate/continue", response_model=CalculatorGenerationResponse)
-def continue_calculator_generation(request: ConversationContinueRequest):
+async def continue_calculator_generation(request: ConversationContinueRequest):
     """
     Continue an existing calculator generation conversation.
     Use this to answer AI's clarifying questions or provide feedback.
     """
     try:
-        response = orchestrator.continue_generation(
+        response = await orchestrator.continue_generation(
             conversation_id=request.conversation_id,
             user_message=request.user_message
         )
@@ -715,9 +828,9 @@ def continue_calculator_generation(request: ConversationContinueRequest):
 
 
 @app.post("/api/calculators/{conversation_id}/save", status_code=201)
-def save_generated_calculator(
+async def save_generated_calculator(
     conversation_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Save an approved calculator from a generation conversation.
@@ -730,7 +843,7 @@ def save_generated_calculator(
             raise HTTPException(status_code=404, detail="Conversation not found or no draft available")
         
         # Create calculator in database
-        calculator = calculator_crud.create_calculator(
+        calculator = await calculator_crud.create_calculator(
             db,
             name=definition.name,
             category=definition.category,
@@ -738,7 +851,7 @@ def save_generated_calculator(
         )
         
         # Create version
-        version = calculator_crud.create_calculator_version(
+        version = await calculator_crud.create_calculator_version(
             db,
             calculator_id=calculator.id,
             definition=definition,
@@ -746,7 +859,8 @@ def save_generated_calculator(
         )
         
         # Auto-approve for now
-        calculator_crud.approve_version(db, version.id, approved_by="admin")
+        await calculator_crud.approve_version(db, version.id, approved_by="admin")
+        await _invalidate_calculator_cache(calculator.id)
         
         return {
             "message": "Calculator saved and activated successfully",
@@ -754,8 +868,7 @@ def save_generated_calculator(
             "version": version.version
         }
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Saving calculator failed for conversation %s", conversation_id)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -764,44 +877,61 @@ def save_generated_calculator(
 # ============================================================================
 
 @app.get("/api/calculators")
-def list_calculators(
+async def list_calculators(
+    response: Response,
     category: Optional[str] = None,
     active_only: bool = True,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List all available calculators."""
-    calculators = calculator_crud.get_all_calculators(
+    response.headers["Cache-Control"] = CALCULATOR_CACHE_CONTROL
+    cache_key = f"{CALCULATOR_LIST_CACHE_PREFIX}{category or ''}:{active_only}"
+    cached = await get_tiered(cache_key)
+    if cached is not None:
+        return cached
+    
+    rows = await calculator_crud.get_all_with_active_version(
         db,
         category=category,
         is_active=active_only if active_only else None
     )
     
-    result = []
-    for calc in calculators:
-        active_version = calculator_crud.get_active_version(db, calc.id)
-        result.append({
-            "id": calc.id,
-            "name": calc.name,
-            "category": calc.category,
-            "description": calc.description,
-            "is_active": calc.is_active,
-            "version": active_version.version if active_version else None,
-            "created_at": calc.created_at.isoformat() if calc.created_at else None
-        })
+    result = [
+        {
+            "id": row.id,
+            "name": row.name,
+            "category": row.category,
+            "description": row.description,
+            "is_active": row.is_active,
+            "version": row.version,
+            "created_at": row.created_at.isoformat() if row.created_at else None
+        }
+        for row in rows
+    ]
     
-    return {"calculators": result, "count": len(result)}
+    listing = {"calculators": result, "count": len(result)}
+    await set_tiered(cache_key, listing)
+    return listing
 
 
 @app.get("/api/calculators/{calculator_id}")
-def get_calculator(calculator_id: str, db: Session = Depends(get_db)):
-    """Get a calculator's full definition."""
-    calculator = calculator_crud.get_calculator(db, calculator_id)
+async def get_calculator(
+    calculator_id: str, request: Request, response: Response, db: AsyncSession = Depends(get_db)
+):
+    """Get a calculator's full definition (supports If-None-Match)."""
+    response.headers["Cache-Control"] = CALCULATOR_CACHE_CONTROL
+    cache_key = _calculator_cache_keys(calculator_id)[0]
+    cached = await get_tiered(cache_key)
+    if cached is not None:
+        return _conditional_response(request, response, cached)
+    
+    calculator = await calculator_crud.get_calculator(db, calculator_id)
     if not calculator:
         raise HTTPException(status_code=404, detail="Calculator not found")
     
-    active_version = calculator_crud.get_active_version(db, calculator_id)
+    active_version = await calculator_crud.get_active_version(db, calculator_id)
     
-    return {
+    detail = {
         "id": calculator.id,
         "name": calculator.name,
         "category": calculator.category,
@@ -811,14 +941,25 @@ def get_calculator(calculator_id: str, db: Session = Depends(get_db)):
         "definition": active_version.definition_json if active_version else None,
         "created_at": calculator.created_at.isoformat() if calculator.created_at else None
     }
+    entry = _etag_entry(detail)
+    await set_tiered(cache_key, entry)
+    return _conditional_response(request, response, entry)
 
 
 @app.get("/api/calculators/{calculator_id}/versions")
-def get_calculator_versions(calculator_id: str, db: Session = Depends(get_db)):
-    """Get version history for a calculator."""
-    versions = calculator_crud.get_calculator_versions(db, calculator_id)
+async def get_calculator_versions(
+    calculator_id: str, request: Request, response: Response, db: AsyncSession = Depends(get_db)
+):
+    """Get version history for a calculator (supports If-None-Match)."""
+    response.headers["Cache-Control"] = CALCULATOR_CACHE_CONTROL
+    cache_key = _calculator_cache_keys(calculator_id)[1]
+    cached = await get_tiered(cache_key)
+    if cached is not None:
+        return _conditional_response(request, response, cached)
     
-    return {
+    versions = await calculator_crud.get_calculator_versions(db, calculator_id)
+    
+    history = {
         "versions": [
             {
                 "id": v.id,
@@ -833,20 +974,30 @@ def get_calculator_versions(calculator_id: str, db: Session = Depends(get_db)):
         ],
         "count": len(versions)
     }
+    entry = _etag_entry(history)
+    await set_tiered(cache_key, entry)
+    return _conditional_response(request, response, entry)
 
 
 @app.post("/api/calculators/{calculator_id}/versions/{version_id}/approve")
-def approve_calculator_version(
+async def approve_calculator_version(
     calculator_id: str,
     version_id: str,
     approval: CalculatorApprovalRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Approve or reject a calculator version."""
     if approval.approved:
-        version = calculator_crud.approve_version(db, version_id, approved_by="admin")
+        version = await calculator_crud.get_calculator_version(db, version_id)
         if not version:
             raise HTTPException(status_code=404, detail="Version not found")
+        # Validate once at approval; executions then reuse the parsed definition
+        try:
+            _get_definition(version)
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid calculator definition: {e}")
+        version = await calculator_crud.approve_version(db, version_id, approved_by="admin")
+        await _invalidate_calculator_cache(version.calculator_id)
         return {"message": "Version approved and activated", "version": version.version}
     else:
         # Could add rejection logic here
@@ -854,11 +1005,12 @@ def approve_calculator_version(
 
 
 @app.delete("/api/calculators/{calculator_id}")
-def delete_calculator(calculator_id: str, db: Session = Depends(get_db)):
+async def delete_calculator(calculator_id: str, db: AsyncSession = Depends(get_db)):
     """Delete a calculator and all its versions."""
-    success = calculator_crud.delete_calculator(db, calculator_id)
+    success = await calculator_crud.delete_calculator(db, calculator_id)
     if not success:
         raise HTTPException(status_code=404, detail="Calculator not found")
+    await _invalidate_calculator_cache(calculator_id)
     return {"message": "Calculator deleted successfully"}
 
 
@@ -866,44 +1018,120 @@ def delete_calculator(calculator_id: str, db: Session = Depends(get_db)):
 # CALCULATOR EXECUTION ENDPOINTS
 # ============================================================================
 
+# Parsed definitions by version id; a version's definition_json never changes after creation
+_DEFINITION_CACHE_SIZE = 512
+_definition_cache: "OrderedDict[str, CalculatorDefinition]" = OrderedDict()
+
+
+def _get_definition(version) -> CalculatorDefinition:
+    """Validate a version's definition once and reuse it (LRU by version id)."""
+    definition = _definition_cache.get(version.id)
+    if definition is None:
+        definition = CalculatorDefinition(**version.definition_json)
+        _definition_cache[version.id] = definition
+        if len(_definition_cache) > _DEFINITION_CACHE_SIZE:
+            _definition_cache.popitem(last=False)
+    else:
+        _definition_cache.move_to_end(version.id)
+    return definition
+
+
+# Executions in flight, keyed by (version id, canonical inputs); identical concurrent
+# requests await the first one's result instead of running the engine again
+_inflight_executions: Dict[Tuple[str, bytes], asyncio.Task] = {}
+
+# Finished executions under the same key; calculators are deterministic and versions immutable
+_RESULT_CACHE_SIZE = 4096
+_result_cache: "OrderedDict[Tuple[str, bytes], CalculatorExecutionResult]" = OrderedDict()
+
+
+async def _run_calculator(
+    version_id: str, definition: CalculatorDefinition, inputs: dict
+) -> CalculatorExecutionResult:
+    """
+    Execute a calculator on the worker process pool. Workers keep engines per version, so
+    the definition is only pickled over when the chosen worker has not built that version yet.
+    """
+    loop = asyncio.get_running_loop()
+    pool = app.state.calculator_pool
+    result = await loop.run_in_executor(pool, execute_version, version_id, inputs)
+    if result is None:
+        result = await loop.run_in_executor(pool, execute_version, version_id, inputs, definition)
+    return result
+
+
+def _finish_execution(key: Tuple[str, bytes], task: asyncio.Task) -> None:
+    """Done callback of a shared run: cache a result, drop the in-flight entry."""
+    if _inflight_executions.get(key) is task:
+        del _inflight_executions[key]
+    if task.cancelled():
+        return
+    if task.exception() is not None:
+        return  # waiters re-raise it; reading it here stops "never retrieved" warnings
+    _result_cache[key] = task.result()
+    if len(_result_cache) > _RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+
+
+async def _execute_coalesced(version_id: str, definition: CalculatorDefinition, inputs: dict):
+    """Execute once per distinct (version, inputs); returns (result, ran_here)."""
+    key = (version_id, orjson.dumps(inputs, option=orjson.OPT_SORT_KEYS))
+    cached = _result_cache.get(key)
+    if cached is not None:
+        _result_cache.move_to_end(key)
+        # execution_time_ms describes this request, and a cache hit runs nothing
+        return cached.model_copy(update={"execution_time_ms": 0.0}), False
+    
+    # The run is its own task and every caller (its starter included) awaits it through
+    # shield, so a disconnecting client never cancels the run for the others
+    task = _inflight_executions.get(key)
+    ran_here = task is None
+    if ran_here:
+        task = asyncio.ensure_future(_run_calculator(version_id, definition, inputs))
+        _inflight_executions[key] = task
+        task.add_done_callback(functools.partial(_finish_execution, key))
+    return await asyncio.shield(task), ran_here
+
+
 @app.post("/api/calculators/{calculator_id}/execute", response_model=CalculatorExecutionResult)
-def execute_calculator(
+@rate_limit(monitoring.EXECUTE_RATE_LIMIT)
+async def execute_calculator(
     calculator_id: str,
-    request: CalculatorExecutionRequest,
-    db: Session = Depends(get_db)
+    request: Request,
+    execution: CalculatorExecutionRequest,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Execute a calculator with given inputs.
     Returns full step-by-step calculation trace.
     """
     # Get calculator and active version
-    calculator = calculator_crud.get_calculator(db, calculator_id)
+    calculator = await calculator_crud.get_calculator(db, calculator_id)
     if not calculator:
         raise HTTPException(status_code=404, detail="Calculator not found")
     
-    active_version = calculator_crud.get_active_version(db, calculator_id)
+    active_version = await calculator_crud.get_active_version(db, calculator_id)
     if not active_version:
         raise HTTPException(status_code=400, detail="No active version for this calculator")
     
     # Parse definition
     try:
-        definition = CalculatorDefinition(**active_version.definition_json)
+        definition = _get_definition(active_version)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Invalid calculator definition: {str(e)}")
     
-    # Execute
-    engine = CalculatorEngine(definition)
-    result = engine.execute(request.inputs)
+    # Execute off the event loop, sharing the run with identical concurrent requests
+    with observe(CALCULATOR_EXECUTION_SECONDS, calculator_id):
+        result, ran_here = await _execute_coalesced(active_version.id, definition, execution.inputs)
     
-    # Log execution
-    if result.success:
-        calculator_crud.log_calculation(
-            db,
+    # Log execution (once per actual run)
+    if result.success and ran_here:
+        enqueue_calculation_log(
             calculator_id=calculator_id,
             version_id=active_version.id,
-            inputs=request.inputs,
+            inputs=execution.inputs,
             outputs=result.outputs,
-            trace=[step.dict() for step in result.steps],
+            trace=result.model_dump(mode="json", include={"steps"})["steps"],
             execution_time_ms=result.execution_time_ms
         )
     
@@ -911,60 +1139,114 @@ def execute_calculator(
 
 
 @app.post("/api/calculators/{calculator_id}/execute-with-explanation")
-def execute_calculator_with_explanation(
+async def execute_calculator_with_explanation(
     calculator_id: str,
     request: CalculatorExecutionRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Execute a calculator and get AI-generated explanation of results.
     """
     # Get calculator and execute
-    calculator = calculator_crud.get_calculator(db, calculator_id)
+    calculator = await calculator_crud.get_calculator(db, calculator_id)
     if not calculator:
         raise HTTPException(status_code=404, detail="Calculator not found")
     
-    active_version = calculator_crud.get_active_version(db, calculator_id)
+    active_version = await calculator_crud.get_active_version(db, calculator_id)
     if not active_version:
         raise HTTPException(status_code=400, detail="No active version for this calculator")
     
-    definition = CalculatorDefinition(**active_version.definition_json)
-    engine = CalculatorEngine(definition)
-    result = engine.execute(request.inputs)
+    definition = _get_definition(active_version)
+    result = await _run_calculator(active_version.id, definition, request.inputs)
+    
+    # Dump once; the step trace is shared by the prompt, the log and the response
+    result_dump = result.model_dump(mode="json")
     
     if not result.success:
         return {
-            "result": result.dict(),
+            "result": result_dump,
             "explanation": None,
             "error": result.error
         }
     
     # Generate AI explanation
-    explanation_result = generate_result_explanation(
+    explanation_result = await generate_result_explanation(
         definition=definition,
         inputs=request.inputs,
         outputs=result.outputs,
-        trace=[step.dict() for step in result.steps]
+        trace=result_dump["steps"]
     )
     
     # Log execution
-    calculator_crud.log_calculation(
-        db,
+    enqueue_calculation_log(
         calculator_id=calculator_id,
         version_id=active_version.id,
         inputs=request.inputs,
         outputs=result.outputs,
-        trace=[step.dict() for step in result.steps],
+        trace=result_dump["steps"],
         execution_time_ms=result.execution_time_ms
     )
     
     return {
-        "result": result.dict(),
+        "result": result_dump,
         "explanation": explanation_result.get("explanation"),
         "success": True
     }
 
 
+def _sse_event(event: str, data) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+@app.post("/api/calculators/{calculator_id}/execute-with-explanation/stream")
+async def stream_calculator_with_explanation(
+    calculator_id: str,
+    request: CalculatorExecutionRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Execute a calculator and stream the AI explanation as server-sent events.
+    Events: `result` (execution result), `explanation` (text chunks), `done`.
+    """
+    calculator = await calculator_crud.get_calculator(db, calculator_id)
+    if not calculator:
+        raise HTTPException(status_code=404, detail="Calculator not found")
+    
+    active_version = await calculator_crud.get_active_version(db, calculator_id)
+    if not active_version:
+        raise HTTPException(status_code=400, detail="No active version for this calculator")
+    
+    definition = _get_definition(active_version)
+    result = await _run_calculator(active_version.id, definition, request.inputs)
+    result_dump = result.model_dump(mode="json")
+    trace = result_dump["steps"]
+    
+    # Queue the audit log before streaming starts
+    if result.success:
+        enqueue_calculation_log(
+            calculator_id=calculator_id,
+            version_id=active_version.id,
+            inputs=request.inputs,
+            outputs=result.outputs,
+            trace=trace,
+            execution_time_ms=result.execution_time_ms
+        )
+    
+    async def events():
+        yield _sse_event("result", result_dump)
+        if result.success:
+            async for chunk in stream_result_explanation(
+                definition=definition,
+                inputs=request.inputs,
+                outputs=result.outputs,
+                trace=trace
+            ):
+                yield _sse_event("explanation", chunk)
+        yield _sse_event("done", {"success": result.success, "error": result.error})
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @app.post("/api/calculators/preview-execute", response_model=CalculatorExecutionResult)
 def preview_execute_calculator(
     request: PreviewExecutionRequest
@@ -989,7 +1271,7 @@ def preview_execute_calculator(
 # ============================================================================
 
 @app.post("/api/calculators/init-samples", status_code=201)
-def initialize_sample_calculators(db: Session = Depends(get_db)):
+async def initialize_sample_calculators(db: AsyncSession = Depends(get_db)):
     """
     Initialize the system with sample calculators (EMI, SIP, Tax).
     Use this to bootstrap the system with working examples.
@@ -997,15 +1279,14 @@ def initialize_sample_calculators(db: Session = Depends(get_db)):
     try:
         samples = create_sample_calculators()
         created = []
+        existing = await calculator_crud.get_existing_calculator_names(db, [d.name for d in samples])
         
         for definition in samples:
-            # Check if already exists
-            existing = calculator_crud.get_all_calculators(db)
-            if any(c.name == definition.name for c in existing):
+            if definition.name in existing:
                 continue
             
             # Create calculator
-            calculator = calculator_crud.create_calculator(
+            calculator = await calculator_crud.create_calculator(
                 db,
                 name=definition.name,
                 category=definition.category,
@@ -1013,13 +1294,13 @@ def initialize_sample_calculators(db: Session = Depends(get_db)):
             )
             
             # Create and approve version
-            version = calculator_crud.create_calculator_version(
+            version = await calculator_crud.create_calculator_version(
                 db,
                 calculator_id=calculator.id,
                 definition=definition,
                 created_by="system"
             )
-            calculator_crud.approve_version(db, version.id, approved_by="system")
+            await calculator_crud.approve_version(db, version.id, approved_by="system")
             
             created.append({
                 "id": calculator.id,
@@ -1027,16 +1308,27 @@ def initialize_sample_calculators(db: Session = Depends(get_db)):
                 "category": definition.category
             })
         
+        if created:
+            await _invalidate_calculator_cache()
+        
         return {
             "message": f"Initialized {len(created)} sample calculators",
             "calculators": created
         }
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Sample calculator initialization failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # One worker per core; "auto" picks uvloop/httptools when installed (uvicorn[standard])
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=WEB_WORKERS,
+        loop="auto",
+        http="auto",
+        access_log=False
+    )
 
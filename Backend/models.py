@@ -4,8 +4,10 @@ Comprehensive schema matching Consolidated Template and Master Specification.
 """
 from sqlalchemy import (
     Boolean, Column, ForeignKey, Integer, String, Float, 
-    Date, Enum as SQLEnum, Text
+    Date, DateTime, SmallInteger, Text
 )
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from database import Base
 from enums import (
@@ -13,12 +15,40 @@ from enums import (
     LiabilityType, AccountType, PolicyType
 )
 import uuid
+from datetime import datetime
 
 
 def generate_uuid():
     return str(uuid.uuid4())
 
 
+class SmallIntEnum(TypeDecorator):
+    """Stores a str Enum as its SmallInteger position; the API keeps the string values.
+
+    Codes follow declaration order, so new members must be appended to the end of the enum.
+    """
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_cls):
+        super().__init__()
+        self.enum_cls = enum_cls
+        self._members = list(enum_cls)
+        # str-Enum members hash like their values, so this resolves members and raw values alike
+        self._codes = {m: i for i, m in enumerate(self._members)}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[self.enum_cls[value]]  # member name, e.g. "STOCK"
+        return code
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else self._members[value]
+
+
 # ============================================================================
 # USER & FAMILY
 # ============================================================================
@@ -40,8 +70,12 @@ class User(Base):
     designation = Column(String, nullable=True)
     organisation = Column(String, nullable=True)
     
+    # Bumped on any change to the user's plan data (used to key cached analyses)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
     # Relationships
-    spouse = relationship("Spouse", back_populates="user", uselist=False)
+    # One-to-one rows used with nearly every user read: load them eagerly in one IN query
+    spouse = relationship("Spouse", back_populates="user", uselist=False, lazy="selectin")
     family_members = relationship("FamilyMember", back_populates="user")
     goals = relationship("Goal", back_populates="user")
     real_estate_assets = relationship("RealEstateAsset", back_populates="user")
@@ -49,8 +83,8 @@ class User(Base):
     investment_assets = relationship("InvestmentAsset", back_populates="user")
     insurance_policies = relationship("InsurancePolicy", back_populates="user")
     liabilities = relationship("Liability", back_populates="user")
-    cash_flow = relationship("CashFlow", back_populates="user", uselist=False)
-    assumptions = relationship("Assumptions", back_populates="user", uselist=False)
+    cash_flow = relationship("CashFlow", back_populates="user", uselist=False, lazy="selectin")
+    assumptions = relationship("Assumptions", back_populates="user", uselist=False, lazy="selectin")
 
 
 class Spouse(Base):
@@ -82,7 +116,7 @@ class FamilyMember(Base):
     name = Column(String)
     dob = Column(Date, nullable=True)
     pan = Column(String, nullable=True)  # Optional
-    relation_type = Column(SQLEnum(RelationshipType))  # Renamed from 'relationship'
+    relation_type = Column(SmallIntEnum(RelationshipType))  # Renamed from 'relationship'
     expected_retirement_age = Column(Integer, nullable=True)  # For earning members
     
     user = relationship("User", back_populates="family_members")
@@ -102,7 +136,7 @@ class Goal(Base):
     person_name = Column(String, nullable=True)  # Link to family member name
     name = Column(String)  # Goal name (e.g., "Child 1 Graduation")
     current_cost = Column(Float)
-    target_type = Column(SQLEnum(TargetType))
+    target_type = Column(SmallIntEnum(TargetType))
     target_value = Column(String)  # Age (as string) or Date (YYYY-MM-DD)
     
     user = relationship("User", back_populates="goals")
@@ -137,7 +171,7 @@ class BankAccount(Base):
     id = Column(String, primary_key=True, index=True, default=generate_uuid)
     user_id = Column(String, ForeignKey("users.id"))
     bank_name = Column(String)
-    account_type = Column(SQLEnum(AccountType))
+    account_type = Column(SmallIntEnum(AccountType))
     balance = Column(Float)
     interest_rate = Column(Float, nullable=True)
     maturity_date = Column(Date, nullable=True)
@@ -152,7 +186,7 @@ class InvestmentAsset(Base):
     
     id = Column(String, primary_key=True, index=True, default=generate_uuid)
     user_id = Column(String, ForeignKey("users.id"))
-    type = Column(SQLEnum(InvestmentType))
+    type = Column(SmallIntEnum(InvestmentType))
     invested_amount = Column(Float, nullable=True)
     current_value = Column(Float)
     monthly_sip = Column(Float, default=0)
@@ -170,7 +204,7 @@ class InsurancePolicy(Base):
     id = Column(String, primary_key=True, index=True, default=generate_uuid)
     user_id = Column(String, ForeignKey("users.id"))
     policy_name = Column(String)
-    policy_type = Column(SQLEnum(PolicyType))
+    policy_type = Column(SmallIntEnum(PolicyType))
     sum_assured = Column(Float)
     premium = Column(Float)
     premium_frequency = Column(String, default="Annual")  # Annual/Monthly
@@ -193,7 +227,7 @@ class Liability(Base):
     
     id = Column(String, primary_key=True, index=True, default=generate_uuid)
     user_id = Column(String, ForeignKey("users.id"))
-    type = Column(SQLEnum(LiabilityType))
+    type = Column(SmallIntEnum(LiabilityType))
     total_loan_amount = Column(Float, nullable=True)
     outstanding = Column(Float)
     emi = Column(Float)
@@ -253,29 +287,30 @@ class CashFlow(Base):
     
     user = relationship("User", back_populates="cash_flow")
     
-    @property
+    # Totals work on instances and as SQL expressions (e.g. filter on total_inflow)
+    @hybrid_property
     def total_inflow(self):
         return (self.primary_income + self.spouse_income + 
                 self.rental_income + self.additional_income + self.other_income)
     
-    @property  
+    @hybrid_property
     def total_essential_expenses(self):
         return (self.house_rent + self.maintenance + self.property_tax + 
                 self.utilities + self.groceries + self.transportation + 
                 self.medical_expenses + self.children_school_fees + 
                 self.insurance_premiums + self.essential_other)
     
-    @property
+    @hybrid_property
     def total_lifestyle_expenses(self):
         return (self.maid_expense + self.shopping + self.travel + 
                 self.dining_entertainment + self.lifestyle_other)
     
-    @property
+    @hybrid_property
     def total_investments(self):
         return (self.mf_sip + self.stock_sip + self.rd_contribution + 
                 self.chit_fund + self.investment_other)
     
-    @property
+    @hybrid_property
     def total_outflow(self):
         return (self.total_essential_expenses + self.total_lifestyle_expenses + 
                 self.linked_emis + self.linked_investments)
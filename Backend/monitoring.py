@@ -0,0 +1,66 @@
+"""
+Rate Limiting and Latency Metrics
+Per-client limits on the expensive endpoints (SlowAPI) and latency histograms
+for P50/P95/P99 tracking (Prometheus, exported at /metrics).
+Both are optional: without slowapi nothing is limited, without prometheus_client nothing is recorded.
+"""
+import time
+from contextlib import contextmanager
+
+from fastapi import FastAPI, HTTPException, Response
+
+try:
+    from slowapi import Limiter, _rate_limit_exceeded_handler
+    from slowapi.errors import RateLimitExceeded
+    from slowapi.util import get_remote_address
+except ImportError:  # slowapi is optional; endpoints are then unlimited
+    Limiter = None
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, Histogram, generate_latest
+except ImportError:  # prometheus_client is optional; timings are then dropped
+    Histogram = None
+
+EXECUTE_RATE_LIMIT = "30/minute"
+GENERATION_RATE_LIMIT = "10/minute"  # each call spends LLM quota
+
+limiter = Limiter(key_func=get_remote_address) if Limiter is not None else None
+
+CALCULATOR_EXECUTION_SECONDS = Histogram(
+    "calc_exec_seconds", "Calculator execution latency", ["calculator_id"]
+) if Histogram is not None else None
+GENERATION_SECONDS = Histogram(
+    "calc_generation_seconds", "AI calculator generation latency", ["stage"]
+) if Histogram is not None else None
+
+
+def setup(app: FastAPI) -> None:
+    """Attach the limiter and its 429 handler to the app (no-op without slowapi)."""
+    if limiter is not None:
+        app.state.limiter = limiter
+        app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+
+def rate_limit(limit: str):
+    """Limit an endpoint per client address. The endpoint must take `request: Request`."""
+    if limiter is None:
+        return lambda func: func
+    return limiter.limit(limit)
+
+
+@contextmanager
+def observe(histogram, *labels: str):
+    """Record the duration of the block in histogram (if metrics are enabled)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if histogram is not None:
+            histogram.labels(*labels).observe(time.perf_counter() - start)
+
+
+def metrics_response() -> Response:
+    """Prometheus exposition of all metrics in this process."""
+    if Histogram is None:
+        raise HTTPException(status_code=404, detail="Metrics are not enabled (prometheus_client is not installed)")
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
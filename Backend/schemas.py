@@ -4,12 +4,13 @@ Matches the Consolidated Template and Master Specification exactly.
 """
 from pydantic import BaseModel, Field
 from typing import List, Optional
+from typing_extensions import TypedDict
 from datetime import date
 import uuid
 
 from enums import (
     RelationshipType, TargetType, InvestmentType, 
-    LiabilityType, AccountType, PolicyType
+    LiabilityTypeName, AccountType, PolicyTypeName
 )
 
 
@@ -48,6 +49,7 @@ class PrimaryUser(BaseModel):
     
     class Config:
         populate_by_name = True
+        frozen = True  # read-only input; hashable for memoized calculations
 
 
 class SpouseInfo(BaseModel):
@@ -57,6 +59,9 @@ class SpouseInfo(BaseModel):
     working_status: bool = False
     retirement_age: Optional[int] = Field(default=60, description="Spouse retirement age")
     pension_till_age: Optional[int] = Field(default=85, description="Age until pension is required")
+    
+    class Config:
+        frozen = True
 
 
 class UserProfile(BaseModel):
@@ -66,6 +71,9 @@ class UserProfile(BaseModel):
     family_members: List[FamilyMember] = []  # Children, Parents
     contact_details: Optional[ContactDetails] = None
     address: Optional[str] = None
+    
+    class Config:
+        frozen = True
 
 
 # ============================================================================
@@ -141,7 +149,7 @@ class InsurancePolicy(BaseModel):
     """Insurance policy details"""
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     policy_name: str
-    policy_type: PolicyType
+    policy_type: PolicyTypeName
     sum_assured: float
     premium: float  # Annual or monthly premium
     premium_frequency: str = "Annual"  # Annual/Monthly
@@ -150,9 +158,6 @@ class InsurancePolicy(BaseModel):
     end_date: Optional[date] = None
     maturity_amount: Optional[float] = None
     remarks: Optional[str] = None
-    
-    class Config:
-        use_enum_values = True
 
 
 class Assets(BaseModel):
@@ -171,7 +176,7 @@ class Assets(BaseModel):
 class Liability(BaseModel):
     """Loan/Liability with full details"""
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    type: LiabilityType
+    type: LiabilityTypeName
     total_loan_amount: Optional[float] = None
     outstanding: float = Field(alias="outstanding_amount")
     emi: float = Field(alias="monthly_emi")
@@ -180,7 +185,6 @@ class Liability(BaseModel):
     
     class Config:
         populate_by_name = True
-        use_enum_values = True
 
 
 # ============================================================================
@@ -199,36 +203,38 @@ class Inflows(BaseModel):
         populate_by_name = True
 
 
-class EssentialExpenses(BaseModel):
+# Leaf breakdowns are TypedDicts (cheaper to validate than models); a missing key means 0
+
+class EssentialExpenses(TypedDict, total=False):
     """Detailed essential expense breakdown"""
-    house_rent: float = 0
-    maintenance: float = 0
-    property_tax: float = 0
-    utilities: float = 0  # Electricity, Water, Gas
-    groceries: float = 0
-    transportation: float = 0
-    medical_expenses: float = 0
-    children_school_fees: float = 0
-    insurance_premiums: float = 0  # Health, Term etc.
-    other: float = 0
-
-
-class LifestyleExpenses(BaseModel):
+    house_rent: float
+    maintenance: float
+    property_tax: float
+    utilities: float  # Electricity, Water, Gas
+    groceries: float
+    transportation: float
+    medical_expenses: float
+    children_school_fees: float
+    insurance_premiums: float  # Health, Term etc.
+    other: float
+
+
+class LifestyleExpenses(TypedDict, total=False):
     """Detailed lifestyle expense breakdown"""
-    maid_expense: float = 0
-    shopping: float = 0
-    travel: float = 0
-    dining_entertainment: float = 0
-    other: float = 0
+    maid_expense: float
+    shopping: float
+    travel: float
+    dining_entertainment: float
+    other: float
 
 
-class InvestmentOutflows(BaseModel):
+class InvestmentOutflows(TypedDict, total=False):
     """Investment outflows breakdown"""
-    mutual_fund_sip: float = 0
-    stock_sip: float = 0
-    recurring_deposit: float = 0
-    chit_fund: float = 0
-    other: float = 0
+    mutual_fund_sip: float
+    stock_sip: float
+    recurring_deposit: float
+    chit_fund: float
+    other: float
 
 
 class Outflows(BaseModel):
@@ -269,6 +275,7 @@ class Assumptions(BaseModel):
     
     class Config:
         populate_by_name = True
+        frozen = True  # read-only input; hashable for memoized calculations
 
 
 # ============================================================================
@@ -288,6 +295,330 @@ class FullState(BaseModel):
     assumptions: Assumptions = Field(default_factory=Assumptions)
 
 
+# Compiled validator bound once: builds a FullState from a dict without the BaseModel.__init__ wrapper
+validate_fullstate = FullState.__pydantic_validator__.validate_python
+
+
+# ============================================================================
+# UPDATE SCHEMAS (Partial updates - only fields sent by the client are applied)
+# ============================================================================
+
+class UserUpdate(BaseModel):
+    """Partial update for the primary user profile"""
+    name: Optional[str] = None
+    dob: Optional[date] = None
+    retirement_age: Optional[int] = Field(default=None, alias="retire_age")
+    life_expectancy: Optional[int] = None
+    address: Optional[str] = None
+    mobile: Optional[str] = None
+    email: Optional[str] = None
+    designation: Optional[str] = None
+    organisation: Optional[str] = None
+    
+    class Config:
+        populate_by_name = True
+
+
+class FamilyMemberUpdate(BaseModel):
+    """Partial update for a family member"""
+    name: Optional[str] = None
+    dob: Optional[date] = None
+    pan: Optional[str] = None
+    relation_type: Optional[RelationshipType] = None
+    expected_retirement_age: Optional[int] = None
+    
+    class Config:
+        use_enum_values = True
+
+
+class GoalUpdate(BaseModel):
+    """Partial update for a goal"""
+    person_name: Optional[str] = None
+    name: Optional[str] = None
+    current_cost: Optional[float] = None
+    target_type: Optional[TargetType] = None
+    target_value: Optional[str] = None
+    
+    class Config:
+        use_enum_values = True
+
+
+class RealEstateAssetUpdate(BaseModel):
+    """Partial update for a real estate asset"""
+    name: Optional[str] = None
+    present_value: Optional[float] = Field(default=None, alias="value")
+    outstanding_loan: Optional[float] = Field(default=None, alias="loan_outstanding")
+    interest_rate: Optional[float] = None
+    loan_till: Optional[date] = None
+    emi: Optional[float] = None
+    roi: Optional[float] = None
+    remarks: Optional[str] = None
+    
+    class Config:
+        populate_by_name = True
+
+
+class BankAccountUpdate(BaseModel):
+    """Partial update for a bank account"""
+    bank_name: Optional[str] = None
+    account_type: Optional[AccountType] = None
+    balance: Optional[float] = None
+    interest_rate: Optional[float] = None
+    maturity_date: Optional[date] = None
+    remarks: Optional[str] = None
+    
+    class Config:
+        use_enum_values = True
+
+
+class InvestmentAssetUpdate(BaseModel):
+    """Partial update for an investment asset"""
+    type: Optional[InvestmentType] = None
+    invested_amount: Optional[float] = None
+    current_value: Optional[float] = None
+    monthly_sip: Optional[float] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    remarks: Optional[str] = None
+    
+    class Config:
+        use_enum_values = True
+
+
+class InsurancePolicyUpdate(BaseModel):
+    """Partial update for an insurance policy"""
+    policy_name: Optional[str] = None
+    policy_type: Optional[PolicyTypeName] = None
+    sum_assured: Optional[float] = None
+    premium: Optional[float] = None
+    premium_frequency: Optional[str] = None
+    ppt: Optional[int] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    maturity_amount: Optional[float] = None
+    remarks: Optional[str] = None
+
+
+class LiabilityUpdate(BaseModel):
+    """Partial update for a liability"""
+    type: Optional[LiabilityTypeName] = None
+    total_loan_amount: Optional[float] = None
+    outstanding: Optional[float] = Field(default=None, alias="outstanding_amount")
+    emi: Optional[float] = Field(default=None, alias="monthly_emi")
+    interest_rate: Optional[float] = None
+    tenure_months: Optional[int] = None
+    
+    class Config:
+        populate_by_name = True
+
+
+# ============================================================================
+# RESPONSE SCHEMAS (Stored records read straight from ORM rows)
+# ============================================================================
+
+class UserOut(BaseModel):
+    """Stored primary user row"""
+    id: str
+    name: Optional[str] = None
+    dob: Optional[date] = None
+    retirement_age: Optional[int] = None
+    life_expectancy: Optional[int] = None
+    address: Optional[str] = None
+    mobile: Optional[str] = None
+    email: Optional[str] = None
+    designation: Optional[str] = None
+    organisation: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class SpouseOut(BaseModel):
+    """Stored spouse row"""
+    id: str
+    user_id: Optional[str] = None
+    name: Optional[str] = None
+    dob: Optional[date] = None
+    working_status: Optional[bool] = None
+    pan: Optional[str] = None
+    mobile: Optional[str] = None
+    email: Optional[str] = None
+    designation: Optional[str] = None
+    organisation: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class FamilyMemberOut(BaseModel):
+    """Stored family member row"""
+    id: str
+    user_id: Optional[str] = None
+    name: Optional[str] = None
+    dob: Optional[date] = None
+    pan: Optional[str] = None
+    relation_type: Optional[RelationshipType] = None
+    expected_retirement_age: Optional[int] = None
+    
+    class Config:
+        from_attributes = True
+        use_enum_values = True
+
+
+class GoalOut(BaseModel):
+    """Stored goal row"""
+    id: str
+    user_id: Optional[str] = None
+    person_name: Optional[str] = None
+    name: Optional[str] = None
+    current_cost: Optional[float] = None
+    target_type: Optional[TargetType] = None
+    target_value: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+        use_enum_values = True
+
+
+class RealEstateAssetOut(BaseModel):
+    """Stored real estate row"""
+    id: str
+    user_id: Optional[str] = None
+    name: Optional[str] = None
+    present_value: Optional[float] = None
+    outstanding_loan: Optional[float] = None
+    interest_rate: Optional[float] = None
+    loan_till: Optional[date] = None
+    emi: Optional[float] = None
+    roi: Optional[float] = None
+    remarks: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class BankAccountOut(BaseModel):
+    """Stored bank account row"""
+    id: str
+    user_id: Optional[str] = None
+    bank_name: Optional[str] = None
+    account_type: Optional[AccountType] = None
+    balance: Optional[float] = None
+    interest_rate: Optional[float] = None
+    maturity_date: Optional[date] = None
+    remarks: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+        use_enum_values = True
+
+
+class InvestmentAssetOut(BaseModel):
+    """Stored investment row"""
+    id: str
+    user_id: Optional[str] = None
+    type: Optional[InvestmentType] = None
+    invested_amount: Optional[float] = None
+    current_value: Optional[float] = None
+    monthly_sip: Optional[float] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    remarks: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+        use_enum_values = True
+
+
+class InsurancePolicyOut(BaseModel):
+    """Stored insurance policy row"""
+    id: str
+    user_id: Optional[str] = None
+    policy_name: Optional[str] = None
+    policy_type: Optional[PolicyTypeName] = None
+    sum_assured: Optional[float] = None
+    premium: Optional[float] = None
+    premium_frequency: Optional[str] = None
+    ppt: Optional[int] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    maturity_amount: Optional[float] = None
+    remarks: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class LiabilityOut(BaseModel):
+    """Stored liability row"""
+    id: str
+    user_id: Optional[str] = None
+    type: Optional[LiabilityTypeName] = None
+    total_loan_amount: Optional[float] = None
+    outstanding: Optional[float] = None
+    emi: Optional[float] = None
+    interest_rate: Optional[float] = None
+    tenure_months: Optional[int] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class AssumptionsOut(BaseModel):
+    """Stored (or default) assumptions"""
+    id: Optional[str] = None
+    user_id: Optional[str] = None
+    inflation: float
+    pre_retire_roi: float
+    post_retire_roi: float
+    
+    class Config:
+        from_attributes = True
+
+
+class UserProfileResponse(BaseModel):
+    """GET /api/users/{user_id}"""
+    user: UserOut
+    spouse: Optional[SpouseOut] = None
+    family_members: List[FamilyMemberOut] = []
+    goals: List[GoalOut] = []
+
+
+class FamilyMembersResponse(BaseModel):
+    family_members: List[FamilyMemberOut]
+    count: int
+
+
+class GoalsResponse(BaseModel):
+    goals: List[GoalOut]
+    count: int
+
+
+class RealEstateListResponse(BaseModel):
+    real_estate: List[RealEstateAssetOut]
+    count: int
+
+
+class BankAccountsResponse(BaseModel):
+    bank_accounts: List[BankAccountOut]
+    count: int
+
+
+class InvestmentsResponse(BaseModel):
+    investments: List[InvestmentAssetOut]
+    count: int
+
+
+class InsurancePoliciesResponse(BaseModel):
+    insurance_policies: List[InsurancePolicyOut]
+    count: int
+
+
+class LiabilitiesResponse(BaseModel):
+    liabilities: List[LiabilityOut]
+    count: int
+
+
 # ============================================================================
 # OUTPUT SCHEMAS (Dashboard Metrics)
 # ============================================================================
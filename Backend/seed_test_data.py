@@ -206,9 +206,9 @@ TEST_FINANCIAL_DATA = {
 }
 
 if __name__ == "__main__":
-    import json
+    import orjson
     print("=== TEST FINANCIAL DATA ===")
-    print(json.dumps(TEST_FINANCIAL_DATA, indent=2))
+    print(orjson.dumps(TEST_FINANCIAL_DATA, option=orjson.OPT_INDENT_2).decode())
     print("\n\nTo use this data:")
     print("1. Copy the above JSON")
     print("2. Load it into the frontend via the load-test-data page")
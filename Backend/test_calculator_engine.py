@@ -3,6 +3,9 @@ Unit Tests for Calculator Execution Engine
 Tests expression evaluator, rule engines, and full calculator execution.
 """
 from datetime import datetime
+from functools import lru_cache
+import numpy as np
+import pytest
 from calculator_engine import (
     SafeExpressionEvaluator, RuleEngines, CalculatorEngine, 
     create_sample_calculators
@@ -10,6 +13,16 @@ from calculator_engine import (
 from calculator_schemas import CalculatorDefinition, CalculatorInput, CalculatorStep
 
 
+@lru_cache(maxsize=1)
+def _samples_by_name():
+    return {c.name: c for c in create_sample_calculators()}
+
+
+def get_sample(name: str) -> CalculatorDefinition:
+    """Sample calculator by name, built once per run (the engine never mutates definitions)."""
+    return _samples_by_name()[name]
+
+
 class TestSafeExpressionEvaluator:
     """Test the AST-based expression evaluator."""
     
@@ -73,6 +86,11 @@ class TestSafeExpressionEvaluator:
         evaluator.context["regime"] = "new"
         result = evaluator.evaluate("tax_old if regime == 'old' else tax_new")
         assert result == 30000
+        
+        # Compiled once, evaluated against different contexts
+        choose_tax = SafeExpressionEvaluator.compile("tax_old if regime == 'old' else tax_new")
+        assert choose_tax({"regime": "old", "tax_old": 50000, "tax_new": 30000}) == 50000
+        assert choose_tax({"regime": "new", "tax_old": 50000, "tax_new": 30000}) == 30000
     
     def test_emi_formula(self):
         """Test the EMI formula expression."""
@@ -90,6 +108,14 @@ class TestSafeExpressionEvaluator:
         
         # Expected EMI is approximately 88849
         assert abs(result - 88849) < 1
+        
+        # The cached compiled formula is reused for a different loan
+        emi = SafeExpressionEvaluator.compile(
+            "principal * monthly_rate * pow(1 + monthly_rate, tenure_months) / "
+            "(pow(1 + monthly_rate, tenure_months) - 1)"
+        )
+        assert abs(emi(evaluator.context) - result) < 1e-9
+        assert abs(emi({"principal": 500000, "monthly_rate": 0.01, "tenure_months": 12}) - result / 2) < 1e-6
     
     def test_invalid_expression_raises_error(self):
         evaluator = SafeExpressionEvaluator()
@@ -104,31 +130,19 @@ class TestSafeExpressionEvaluator:
 class TestRuleEngines:
     """Test pre-built rule engines."""
     
-    def test_income_tax_old_regime_below_250k(self):
-        tax = RuleEngines.income_tax_slabs_india_old(200000)
-        assert tax == 0
+    @pytest.mark.parametrize("income, expected", [
+        (200000, 0),        # below 250k
+        (400000, 7500),     # 150000 @ 5%
+        (800000, 72500),    # 12500 + 300k @ 20%
+        (1500000, 262500),  # 12500 + 100000 + 500k @ 30%
+    ])
+    def test_income_tax_old_regime(self, income, expected):
+        assert RuleEngines.income_tax_slabs_india_old(income) == expected
     
-    def test_income_tax_old_regime_5_percent_slab(self):
-        # 400000 - 250000 = 150000 @ 5% = 7500
-        tax = RuleEngines.income_tax_slabs_india_old(400000)
-        assert tax == 7500
-    
-    def test_income_tax_old_regime_20_percent_slab(self):
-        # First 250k = 0
-        # 250k - 500k = 250k @ 5% = 12500
-        # 500k - 800k = 300k @ 20% = 60000
-        # Total = 72500
-        tax = RuleEngines.income_tax_slabs_india_old(800000)
-        assert tax == 72500
-    
-    def test_income_tax_old_regime_30_percent_slab(self):
-        # First 250k = 0
-        # 250k - 500k = 12500
-        # 500k - 1000k = 100000
-        # 1000k - 1500k = 150000
-        # Total = 262500
-        tax = RuleEngines.income_tax_slabs_india_old(1500000)
-        assert tax == 262500
+    def test_income_tax_old_regime_vectorised(self):
+        incomes = [200000, 400000, 800000, 1500000]
+        taxes = RuleEngines.income_tax_slabs_india_old(np.array(incomes))
+        assert taxes.tolist() == [RuleEngines.income_tax_slabs_india_old(x) for x in incomes]
     
     def test_emi_calculator(self):
         # Loan: 10 lakh, 12% annual, 12 months
@@ -185,8 +199,7 @@ class TestCalculatorEngine:
     
     def test_emi_calculator_execution(self):
         """Test EMI calculator end-to-end."""
-        samples = create_sample_calculators()
-        emi_calc = next(c for c in samples if c.name == "EMI Calculator")
+        emi_calc = get_sample("EMI Calculator")
         
         engine = CalculatorEngine(emi_calc)
         result = engine.execute({
@@ -209,8 +222,7 @@ class TestCalculatorEngine:
     
     def test_sip_calculator_execution(self):
         """Test SIP calculator end-to-end."""
-        samples = create_sample_calculators()
-        sip_calc = next(c for c in samples if c.name == "SIP Calculator")
+        sip_calc = get_sample("SIP Calculator")
         
         engine = CalculatorEngine(sip_calc)
         result = engine.execute({
@@ -229,8 +241,7 @@ class TestCalculatorEngine:
     
     def test_tax_calculator_old_regime(self):
         """Test tax calculator with old regime."""
-        samples = create_sample_calculators()
-        tax_calc = next(c for c in samples if c.name == "Income Tax Calculator (India)")
+        tax_calc = get_sample("Income Tax Calculator (India)")
         
         engine = CalculatorEngine(tax_calc)
         result = engine.execute({
@@ -248,8 +259,7 @@ class TestCalculatorEngine:
     
     def test_tax_calculator_new_regime(self):
         """Test tax calculator with new regime."""
-        samples = create_sample_calculators()
-        tax_calc = next(c for c in samples if c.name == "Income Tax Calculator (India)")
+        tax_calc = get_sample("Income Tax Calculator (India)")
         
         engine = CalculatorEngine(tax_calc)
         result = engine.execute({
@@ -263,8 +273,7 @@ class TestCalculatorEngine:
     
     def test_input_validation_missing_required(self):
         """Test that missing required inputs cause validation errors."""
-        samples = create_sample_calculators()
-        emi_calc = next(c for c in samples if c.name == "EMI Calculator")
+        emi_calc = get_sample("EMI Calculator")
         
         engine = CalculatorEngine(emi_calc)
         result = engine.execute({
@@ -275,10 +284,47 @@ class TestCalculatorEngine:
         assert result.success == False
         assert "required" in result.error.lower()
     
+    def test_execute_batch_matches_scalar_runs(self):
+        """A principal x rate grid in one batch gives the same outputs as one run per cell."""
+        engine = CalculatorEngine(get_sample("EMI Calculator"))
+        principals = np.array([[1000000], [5000000]])
+        rates = np.array([0.0001, 8.5, 12])
+        assert "_batch_runners" not in vars(engine)  # compiled only when a batch runs
+        
+        outputs = engine.execute_batch({
+            "principal": principals,
+            "annual_rate": rates,
+            "tenure_months": 240
+        })
+        
+        assert outputs["emi"].shape == (2, 3)
+        for i, principal in enumerate(principals[:, 0]):
+            for j, rate in enumerate(rates):
+                result = engine.execute({"principal": principal, "annual_rate": rate, "tenure_months": 240})
+                for key, value in result.outputs.items():
+                    assert abs(outputs[key][i, j] - value) < 1e-6
+    
+    def test_execute_batch_tax_with_rule_engines_and_regime_per_scenario(self):
+        """Rule-engine steps and a per-scenario select input agree with scalar runs."""
+        engine = CalculatorEngine(get_sample("Income Tax Calculator (India)"))
+        incomes = np.array([0, 400000, 800000, 1500000, 3000000])
+        regimes = np.array(["old", "new", "old", "new", "old"])
+        
+        outputs = engine.execute_batch({
+            "annual_income": incomes,
+            "deductions": 50000,
+            "regime": regimes
+        })
+        
+        for i, (income, regime) in enumerate(zip(incomes.tolist(), regimes.tolist())):
+            result = engine.execute({"annual_income": income, "deductions": 50000, "regime": regime})
+            assert result.success
+            for key, value in result.outputs.items():
+                assert abs(outputs[key][i] - value) < 1e-6
+    
     def test_execution_time_tracking(self):
         """Test that execution time is tracked."""
-        samples = create_sample_calculators()
-        emi_calc = next(c for c in samples if c.name == "EMI Calculator")
+        emi_calc = get_sample("EMI Calculator")
         
         engine = CalculatorEngine(emi_calc)
         result = engine.execute({
@@ -317,60 +363,5 @@ class TestSampleCalculators:
             assert len(calc.outputs) > 0
 
 
-def run_tests():
-    """Run all tests and print results."""
-    print("\n" + "="*60)
-    print("CALCULATOR ENGINE UNIT TESTS")
-    print("="*60)
-    
-    # Test Expression Evaluator
-    print("\n📐 Testing SafeExpressionEvaluator...")
-    test_eval = TestSafeExpressionEvaluator()
-    test_eval.test_basic_arithmetic()
-    test_eval.test_complex_expressions()
-    test_eval.test_variable_substitution()
-    test_eval.test_functions()
-    test_eval.test_comparisons()
-    test_eval.test_ternary_expression()
-    test_eval.test_emi_formula()
-    print("   ✅ All expression evaluator tests passed!")
-    
-    # Test Rule Engines
-    print("\n📊 Testing RuleEngines...")
-    test_rules = TestRuleEngines()
-    test_rules.test_income_tax_old_regime_below_250k()
-    test_rules.test_income_tax_old_regime_5_percent_slab()
-    test_rules.test_income_tax_old_regime_20_percent_slab()
-    test_rules.test_income_tax_old_regime_30_percent_slab()
-    test_rules.test_emi_calculator()
-    test_rules.test_emi_calculator_zero_rate()
-    test_rules.test_sip_future_value()
-    test_rules.test_cagr_calculator()
-    test_rules.test_lumpsum_future_value()
-    print("   ✅ All rule engine tests passed!")
-    
-    # Test Calculator Engine
-    print("\n🔧 Testing CalculatorEngine...")
-    test_engine = TestCalculatorEngine()
-    test_engine.test_emi_calculator_execution()
-    test_engine.test_sip_calculator_execution()
-    test_engine.test_tax_calculator_old_regime()
-    test_engine.test_tax_calculator_new_regime()
-    test_engine.test_input_validation_missing_required()
-    test_engine.test_execution_time_tracking()
-    print("   ✅ All calculator engine tests passed!")
-    
-    # Test Sample Calculators
-    print("\n📝 Testing Sample Calculators...")
-    test_samples = TestSampleCalculators()
-    test_samples.test_sample_calculators_created()
-    test_samples.test_sample_calculators_have_required_fields()
-    print("   ✅ All sample calculator tests passed!")
-    
-    print("\n" + "="*60)
-    print("🎉 ALL TESTS PASSED!")
-    print("="*60 + "\n")
-
-
 if __name__ == "__main__":
-    run_tests()
+    raise SystemExit(pytest.main([__file__, "-q", "--no-header", "-p", "no:cacheprovider"]))